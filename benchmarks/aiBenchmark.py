@@ -0,0 +1,64 @@
+import sys
+import time
+
+sys.path.insert(0, '.')
+from benchmarks.benchmarkBoards import make_boards
+from modules.aiHelper import AIHelper
+from modules.dictionaryRegistry import get_validator
+from modules.wordFinder import WordFinder
+
+'''
+Measures how long AIHelper.suggest_word takes, as p50/p99 latency per board size.
+Run from the project root:  python benchmarks/aiBenchmark.py [boards]
+
+ - 'start' - nothing found yet, the first AI Helper press of a game
+ - 'found' - same board with half of its words already found, as mid-game
+Boards come from the real Boggle dice with a fixed seed, so runs are comparable.
+The first suggestion maps the word frequency index (frequencyIndex.py), that
+one-off cost is timed separately.
+'''
+
+# p99 target in milliseconds, documented in aiHelper.py
+TARGET_P99_MS = 100
+
+
+def percentile(times, fraction):
+    ordered = sorted(times)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_calls(calls):
+    times = []
+    for helper, board, found in calls:
+        start = time.perf_counter()
+        helper.suggest_word(board, found)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    validator = get_validator()
+    finder = WordFinder(validator)
+    start = time.perf_counter()
+    AIHelper(validator).suggest_word(make_boards(4, 1, seed=0)[0], set())
+    print(f"First suggestion (maps the frequency index): {(time.perf_counter() - start) * 1000:.0f} ms\n")
+    print(f"{'Board':<8}{'Run':<8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for size in (4, 5):
+        boards = make_boards(size, count)
+        helper = AIHelper(validator)
+        found = [set(finder.find_all_words(board)[::2]) for board in boards]
+        runs = [
+            ('start', [(helper, board, set()) for board in boards]),
+            ('found', [(helper, board, words) for board, words in zip(boards, found)]),
+        ]
+        for name, calls in runs:
+            times = time_calls(calls)
+            p99 = percentile(times, 0.99)
+            print(f"{size}x{size:<6}{name:<8}{percentile(times, 0.5):>10.2f}{p99:>10.2f}{max(times):>10.2f}")
+            if p99 > TARGET_P99_MS:
+                print(f"  above target of {TARGET_P99_MS} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import random
+import sys
+
+sys.path.insert(0, '.')
+from modules.boardGen import BoardGenerator
+
+'''
+Seeded boards shared by the benchmark scripts, so every benchmark rolls its
+boards the same way and runs are comparable.
+
+Module Functions:
+ - make_boards(size, count, seed=SEED):
+        - count boards from the real Boggle dice for 4x4 and 5x5 (weighted random
+          letters for other sizes), the same boards for the same seed
+'''
+
+SEED = 2024
+
+
+def make_boards(size, count, seed=SEED):
+    random.seed(seed)
+    generator = BoardGenerator(size)
+    return [generator.generate_candidate() for _ in range(count)]
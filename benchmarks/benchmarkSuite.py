@@ -0,0 +1,244 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, '.')
+from benchmarks.benchmarkBoards import SEED, make_boards
+from modules.aiHelper import AIHelper
+from modules.boardGen import BoardGenerator
+from modules.dictionaryRegistry import get_validator
+from modules.hintService import HintService
+from modules.wordFinder import WordFinder
+
+'''
+Benchmark suite for the hot paths, with JSON results that can be compared between commits.
+Run from the project root:
+
+    python benchmarks/benchmarkSuite.py --output before.json
+    (change the code)
+    python benchmarks/benchmarkSuite.py --output after.json --baseline before.json --threshold 0.15
+
+Sections (--only picks some of them):
+ - dictionary - WordValidator load time and resident memory, measured in a fresh process
+ - solve      - Boards solved per second for 4x4, 5x5 and 6x6 (WordFinder, no solve cache)
+ - generate   - Attempts and time per accepted board for every size and difficulty
+                (attempts are every candidate board solved, over all of generate_in_band's rounds)
+ - ai         - AIHelper.suggest_word and HintService.next_hint latency (p50/p99)
+
+Every corpus comes from a fixed seed (--seed), so two runs measure the same boards.
+With --baseline, every metric present in both files is compared, and the script exits
+with status 1 if any metric got worse by more than --threshold (0.15 = 15%).
+Metrics marked "better": "info" (e.g. words per board) describe the corpus and are never flagged.
+--quick uses smaller corpora for a fast check, its numbers are noisier.
+
+JSON layout:
+    {"meta": {"seed", "quick", "python", "platform", "commit", "time"},
+     "metrics": {"solve.4x4.boards_per_second": {"value": 412.3, "unit": "boards/s", "better": "higher"}, ...}}
+'''
+
+SIZES = (4, 5, 6)
+GRID_SIZES = (4, 5)
+DIFFICULTIES = ('Easy', 'Medium', 'Hard')
+DEFAULT_THRESHOLD = 0.15
+
+# Corpus sizes as (full run, --quick run)
+SOLVE_BOARDS = (300, 60)
+GENERATED_BOARDS = (15, 4)
+AI_BOARDS = (200, 40)
+DICTIONARY_RUNS = (3, 1)
+
+DICTIONARY_PROBE = '''
+import json, resource, sys, time
+sys.path.insert(0, '.')
+start = time.perf_counter()
+from modules.dictionaryRegistry import get_validator
+validator = get_validator()
+load_time = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'load_time': load_time,
+                  'rss': peak if sys.platform == 'darwin' else peak * 1024,
+                  'words': validator.trie.word_count}))
+'''
+
+
+def make_corpus(size, count, seed=SEED):
+    """Seeded boards, from the real dice for 4x4 and 5x5 and weighted random letters for other sizes"""
+    return make_boards(size, count, seed * 100 + size)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def metric(value, unit, better):
+    return {'value': round(value, 4), 'unit': unit, 'better': better}
+
+
+def bench_dictionary(quick, seed):
+    load_times = []
+    rss = []
+    for _ in range(DICTIONARY_RUNS[quick]):
+        output = subprocess.run([sys.executable, '-c', DICTIONARY_PROBE], capture_output=True,
+                                text=True, check=True).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        load_times.append(probe['load_time'])
+        rss.append(probe['rss'])
+    return {
+        'dictionary.load_ms': metric(statistics.median(load_times) * 1000, 'ms', 'lower'),
+        'dictionary.rss_mb': metric(max(rss) / (1024 * 1024), 'MB', 'lower'),
+    }
+
+
+def bench_solve(quick, seed):
+    finder = WordFinder(get_validator())
+    results = {}
+    for size in SIZES:
+        boards = make_corpus(size, SOLVE_BOARDS[quick], seed)
+        start = time.perf_counter()
+        words = sum(len(finder.find_all_words(board)) for board in boards)
+        elapsed = time.perf_counter() - start
+        results[f'solve.{size}x{size}.boards_per_second'] = metric(len(boards) / elapsed, 'boards/s', 'higher')
+        results[f'solve.{size}x{size}.words_per_board'] = metric(words / len(boards), 'words', 'info')
+    return results
+
+
+def bench_generate(quick, seed):
+    results = {}
+    for size in GRID_SIZES:
+        for difficulty in DIFFICULTIES:
+            random.seed(seed)
+            generator = BoardGenerator(size, difficulty)
+            # Boards remembered from earlier runs would make later runs look faster
+            generator.word_finder.cache = None
+            # One progress report per candidate solved, in every round generate_in_band() makes
+            solved = []
+            start = time.perf_counter()
+            # BoardGenerator reports every board it makes, which is not part of the measurement
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(GENERATED_BOARDS[quick]):
+                    generator.generate_in_band(lambda attempt, max_attempts: solved.append(attempt))
+            elapsed = time.perf_counter() - start
+            name = f'generate.{size}x{size}.{difficulty.lower()}'
+            results[f'{name}.attempts_per_board'] = metric(len(solved) / GENERATED_BOARDS[quick], 'attempts', 'lower')
+            results[f'{name}.ms_per_board'] = metric(elapsed / GENERATED_BOARDS[quick] * 1000, 'ms', 'lower')
+    return results
+
+
+def bench_ai(quick, seed):
+    validator = get_validator()
+    finder = WordFinder(validator)
+    helper = AIHelper(validator)
+    results = {}
+    for size in GRID_SIZES:
+        boards = make_corpus(size, AI_BOARDS[quick], seed)
+        # The first call maps the frequency index, which is a one-off cost
+        helper.suggest_word(boards[0], set())
+        beam_times = []
+        hint_times = []
+        for board in boards:
+            start = time.perf_counter()
+            helper.suggest_word(board, set())
+            beam_times.append((time.perf_counter() - start) * 1000)
+
+            hints = HintService(finder.find_all_words_with_paths(board), validator=validator)
+            start = time.perf_counter()
+            hints.next_hint(set())
+            hint_times.append((time.perf_counter() - start) * 1000)
+        for name, times in (('beam', beam_times), ('hint', hint_times)):
+            results[f'ai.{size}x{size}.{name}.p50_ms'] = metric(percentile(times, 0.5), 'ms', 'lower')
+            results[f'ai.{size}x{size}.{name}.p99_ms'] = metric(percentile(times, 0.99), 'ms', 'lower')
+    return results
+
+
+SECTIONS = {
+    'dictionary': bench_dictionary,
+    'solve': bench_solve,
+    'generate': bench_generate,
+    'ai': bench_ai,
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sections, quick, seed):
+    metrics = {}
+    for name in sections:
+        print(f"Running {name}...", file=sys.stderr)
+        metrics.update(SECTIONS[name](quick, seed))
+    return {
+        'meta': {'seed': seed, 'quick': quick, 'python': platform.python_version(),
+                 'platform': platform.platform(), 'commit': git_commit(),
+                 'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'metrics': metrics,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Prints every shared metric, returns the names of the ones that regressed past threshold"""
+    regressions = []
+    print(f"\n{'Metric':<44}{'Baseline':>12}{'Current':>12}{'Change':>10}")
+    for name, current in results['metrics'].items():
+        previous = baseline['metrics'].get(name)
+        if previous is None or previous['value'] == 0:
+            continue
+        change = (current['value'] - previous['value']) / previous['value']
+        worse = -change if current['better'] == 'higher' else change
+        flag = ''
+        if current['better'] != 'info' and worse > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<44}{previous['value']:>12.3f}{current['value']:>12.3f}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def print_results(results):
+    print(f"\n{'Metric':<44}{'Value':>12}  Unit")
+    for name, entry in results['metrics'].items():
+        print(f"{name:<44}{entry['value']:>12.3f}  {entry['unit']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Boggle hot-path benchmarks')
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Largest allowed slow-down as a fraction (default 0.15)')
+    parser.add_argument('--only', nargs='+', choices=list(SECTIONS), default=list(SECTIONS),
+                        help='Sections to run')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--quick', action='store_true', help='Smaller corpora')
+    args = parser.parse_args()
+
+    results = run(args.only, int(args.quick), args.seed)
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\nNo regressions above {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, '.')
+from modules.compactTrie import CompactTrie
+from modules.lexiconCache import load_or_build
+from modules.validation import Trie
+
+'''
+Compares the original dict-per-node Trie with the array-backed CompactTrie.
+Run from the project root:  python benchmarks/lexiconBenchmark.py
+
+For each structure we measure:
+ - Build time for the whole word list
+ - Memory held once building has finished (tracemalloc)
+ - Number of gc-tracked objects it adds
+ - Lookups per second for a mix of words, prefixes and misses
+ - Start-up time when the CompactTrie comes from the memory-mapped cache
+'''
+
+DICTIONARY_PATH = 'data/enable1.txt'
+LOOKUPS = 200000
+
+
+def load_words(path=DICTIONARY_PATH):
+    with open(path, 'r') as f:
+        return [line.strip().upper() for line in f if len(line.strip()) >= 3]
+
+
+def build_trie(words):
+    trie = Trie()
+    for word in words:
+        trie.insert(word)
+    return trie
+
+
+def build_compact(words):
+    return CompactTrie(words)
+
+
+def measure_build(builder, words):
+    # Time the build on its own, since tracemalloc slows allocation down a lot
+    gc.collect()
+    start = time.perf_counter()
+    structure = builder(words)
+    build_time = time.perf_counter() - start
+    del structure
+    gc.collect()
+
+    objects_before = len(gc.get_objects())
+    tracemalloc.start()
+    structure = builder(words)
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    objects = len(gc.get_objects()) - objects_before
+    return structure, build_time, memory, objects
+
+
+def make_queries(words, count, seed=0):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        word = rng.choice(words)
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(word)
+        elif kind < 0.8:
+            queries.append(word[:rng.randint(1, len(word))])
+        else:
+            queries.append(word[:-1] + 'Q' + 'X')
+    return queries
+
+
+def measure_lookups(structure, queries):
+    start = time.perf_counter()
+    for query in queries:
+        structure.starts_with(query)
+        structure.search(query)
+    elapsed = time.perf_counter() - start
+    return len(queries) * 2 / elapsed
+
+
+def main():
+    words = load_words()
+    queries = make_queries(words, LOOKUPS)
+    print(f"{len(words)} words, {len(queries) * 2} lookups per structure\n")
+    print(f"{'Structure':<12}{'Build (s)':>12}{'Memory (MB)':>14}{'GC objects':>14}{'Lookups/s':>14}")
+
+    results = {}
+    for name, builder in (('Trie', build_trie), ('CompactTrie', build_compact)):
+        structure, build_time, memory, objects = measure_build(builder, words)
+        rate = measure_lookups(structure, queries)
+        results[name] = (build_time, memory, objects, rate)
+        print(f"{name:<12}{build_time:>12.2f}{memory / 1e6:>14.1f}{objects:>14}{rate:>14,.0f}")
+        del structure
+        gc.collect()
+
+    trie_memory = results['Trie'][1]
+    compact_memory = results['CompactTrie'][1]
+    print(f"\nCompactTrie uses {trie_memory / compact_memory:.1f}x less memory")
+
+    load_or_build(DICTIONARY_PATH)  # make sure the cache exists
+    start = time.perf_counter()
+    cached = load_or_build(DICTIONARY_PATH)
+    load_time = time.perf_counter() - start
+    rate = measure_lookups(cached, queries)
+    print(f"Cached CompactTrie loads in {load_time * 1000:.1f} ms, {rate:,.0f} lookups/s")
+
+
+if __name__ == '__main__':
+    main()
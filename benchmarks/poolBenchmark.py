@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, '.')
+from benchmarks.benchmarkBoards import make_boards
+from modules.dictionaryRegistry import get_validator
+from modules.solverPool import SolverPool
+from modules.wordFinder import WordFinder
+
+'''
+Measures how SolverPool scales with the number of worker processes.
+Run from the project root:  python benchmarks/poolBenchmark.py [boards]
+
+The same seeded 5x5 boards are solved in-process first (the baseline), then by
+pools of 1, 2, 4, 8 and 16 workers, in ordered and unordered mode.
+Pool start-up (including each worker mapping the dictionary) is timed separately.
+'''
+
+WORKER_COUNTS = [1, 2, 4, 8, 16]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    boards = make_boards(5, count)
+    print(f"{count} 5x5 boards, {os.cpu_count()} CPUs available\n")
+
+    start = time.perf_counter()
+    # No solve cache, the baseline is the search itself
+    expected = [summary.word_count for summary in WordFinder(get_validator()).solve_many(boards)]
+    baseline = time.perf_counter() - start
+    print(f"{'Workers':<10}{'Mode':<11}{'Start-up (s)':>14}{'Boards/s':>12}{'Speedup':>10}")
+    print(f"{'-':<10}{'in-process':<11}{0:>14.2f}{count / baseline:>12.1f}{1:>9.2f}x")
+
+    for workers in WORKER_COUNTS:
+        start = time.perf_counter()
+        with SolverPool(workers) as pool:
+            # Wait for every worker to start and map the dictionary
+            list(pool.solve_many(boards[:workers], ordered=False))
+            startup = time.perf_counter() - start
+            for ordered in (True, False):
+                start = time.perf_counter()
+                summaries = list(pool.solve_many(boards, ordered=ordered))
+                elapsed = time.perf_counter() - start
+                summaries.sort(key=lambda summary: summary.index)
+                if [summary.word_count for summary in summaries] != expected:
+                    print(f"{workers} workers found different word counts")
+                mode = 'ordered' if ordered else 'unordered'
+                print(f"{workers:<10}{mode:<11}{startup:>14.2f}{count / elapsed:>12.1f}{baseline / elapsed:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
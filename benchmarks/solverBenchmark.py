@@ -0,0 +1,140 @@
+import random
+import sys
+import time
+
+sys.path.insert(0, '.')
+from benchmarks.benchmarkBoards import SEED, make_boards
+from modules.boardGen import BoardGenerator
+from modules.boardSearch import DiceLayout
+from modules.compactTrie import CompactTrie
+from modules.dictionaryRegistry import DEFAULT_DICTIONARY, get_validator
+from modules.solverEngine import BoardSolver
+from modules.validation import WordValidator
+from modules.wordFinder import WordFinder
+
+'''
+Compares the WordFinder search modes on the same seeded boards.
+Run from the project root:  python benchmarks/solverBenchmark.py
+
+ - 'prefix' - original DFS, re-walks the trie from the root at every step
+ - 'cursor' - DFS that carries the trie node down the recursion
+ - 'stack'  - iterative solver from solverEngine.py (the default)
+ - 'batch'  - WordFinder.solve_many over the whole list, word counts and scores only
+ - 'update' - BoardSolver.update after one dice change (new face or two dice swapped),
+              compared with solving the changed board from scratch
+Before timing, the 'stack' solver (solve, solve_many and update) is checked against
+the 'prefix' DFS with small word lists where some tiles start no word at all
+(enable1.txt has words for every first letter, so it never has such tiles).
+Boards come from the real Boggle dice with a fixed seed, so runs are comparable.
+'''
+
+BOARDS_PER_SIZE = 200
+# Single-core throughput targets for the 'stack' solver, documented in solverEngine.py
+TARGET_BOARDS_PER_SECOND = {4: 400, 5: 120}
+
+
+def time_mode(finder, boards):
+    start = time.perf_counter()
+    results = [finder.find_all_words(board) for board in boards]
+    return time.perf_counter() - start, results
+
+
+def dead_start_lexicons():
+    """(name, WordValidator) pairs whose word lists leave some letters with no word starting on them"""
+    lexicons = [('fallback', WordValidator(dictionary_path='data/missing_dictionary.txt'))]
+    with open(DEFAULT_DICTIONARY, 'r') as f:
+        words = [line.strip().upper() for line in f if len(line.strip()) >= 3]
+    for name, first_letters in (('A-M', 'ABCDEFGHIJKLM'), ('vowels', 'AEIOU'), ('no-S', 'ABCDEFGHIJKLMNOPQRTUVWXYZ')):
+        validator = WordValidator(dictionary_path='data/missing_dictionary.txt')
+        validator.trie = CompactTrie(word for word in words if word[0] in first_letters)
+        lexicons.append((name, validator))
+    small = WordValidator(dictionary_path='data/missing_dictionary.txt')
+    small.trie = CompactTrie(['ABC', 'ABCD', 'BAD', 'CAB', 'DAB'])
+    lexicons.append(('small', small))
+    return lexicons
+
+
+def check_dead_starts(count=50):
+    """Returns the number of boards where the stack solver and the prefix DFS disagree"""
+    mismatches = 0
+    boards = [[['X', 'A', 'D'], ['B', 'C', 'Z'], ['Z', 'Z', 'Z']]]
+    boards += make_boards(4, count) + make_boards(5, count)
+    for name, validator in dead_start_lexicons():
+        reference = WordFinder(validator, mode='prefix')
+        finder = WordFinder(validator, cache=None)
+        solver = BoardSolver(validator.trie)
+        expected = [reference.find_all_words(board) for board in boards]
+        stack = [finder.find_all_words(board) for board in boards]
+        counts = [summary.word_count for summary in finder.solve_many(boards)]
+        updated = [solver.update(None, board, ()).sorted_words() for board in boards]
+        for index, words in enumerate(expected):
+            if stack[index] != words or counts[index] != len(words) or updated[index] != words:
+                mismatches += 1
+                print(f"Stack solver differs from prefix DFS with the {name} word list on board {index}")
+    return mismatches
+
+
+def main():
+    if check_dead_starts() == 0:
+        print("Stack solver matches the prefix DFS on word lists with dead start tiles\n")
+    validator = get_validator()
+    modes = ['prefix', 'cursor', 'stack']
+    print(f"{'Board':<8}{'Mode':<10}{'Boards/s':>12}{'ms/board':>12}{'Speedup':>10}")
+    for size in (4, 5):
+        boards = make_boards(size, BOARDS_PER_SIZE)
+        baseline = None
+        expected = None
+        for mode in modes:
+            elapsed, results = time_mode(WordFinder(validator, mode=mode), boards)
+            if expected is None:
+                expected = results
+                baseline = elapsed
+            elif results != expected:
+                print(f"Mode {mode} found different words on {size}x{size} boards")
+            rate = len(boards) / elapsed
+            print(f"{size}x{size:<6}{mode:<10}{rate:>12.1f}"
+                  f"{elapsed / len(boards) * 1000:>12.2f}{baseline / elapsed:>9.2f}x")
+            if mode == 'stack' and rate < TARGET_BOARDS_PER_SECOND[size]:
+                print(f"  below target of {TARGET_BOARDS_PER_SECOND[size]} boards/s")
+
+        finder = WordFinder(validator)
+        start = time.perf_counter()
+        counts = [summary.word_count for summary in finder.solve_many(boards)]
+        elapsed = time.perf_counter() - start
+        if counts != [len(words) for words in expected]:
+            print(f"solve_many found different word counts on {size}x{size} boards")
+        print(f"{size}x{size:<6}{'batch':<10}{len(boards) / elapsed:>12.1f}"
+              f"{elapsed / len(boards) * 1000:>12.2f}{baseline / elapsed:>9.2f}x")
+        time_updates(validator, size)
+
+
+def time_updates(validator, size, count=BOARDS_PER_SIZE, seed=SEED):
+    random.seed(seed)
+    dice = BoardGenerator.CLASSIC_DICE if size == 4 else BoardGenerator.BIG_DICE
+    layout = DiceLayout.roll(dice, size)
+    edits = []
+    for _ in range(count):
+        layout, changed = layout.mutate()
+        edits.append((layout.letters(), changed))
+
+    full_solver = BoardSolver(validator.trie)
+    start = time.perf_counter()
+    expected = [full_solver.solve(board).sorted_words() for board, _ in edits]
+    full_time = time.perf_counter() - start
+
+    solver = BoardSolver(validator.trie)
+    result = solver.update(None, edits[0][0], ())
+    start = time.perf_counter()
+    results = []
+    for board, changed in edits:
+        result = solver.update(result, board, changed)
+        results.append(result.sorted_words())
+    elapsed = time.perf_counter() - start
+    if results != expected:
+        print(f"update found different words on {size}x{size} boards")
+    print(f"{size}x{size:<6}{'update':<10}{count / elapsed:>12.1f}"
+          f"{elapsed / count * 1000:>12.2f}{full_time / elapsed:>9.2f}x (vs full solve)")
+
+
+if __name__ == '__main__':
+    main()
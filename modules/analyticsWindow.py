@@ -1,8 +1,9 @@
 import sys
-import json
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, QDialog, QHBoxLayout, QPushButton, QScrollArea, QMessageBox)
 from PyQt5.QtCore import Qt, QTimer
+from modules.historyStore import get_history_store
+from modules.postGameAnalysis import get_post_game_analyser
 
 
 class DeleteGameDialog(QDialog):
@@ -77,10 +78,8 @@ class AnalyticsWindow(QWidget):
         self.game_data = game_data
         self.main_window = main_window
 
-        self.missed_words = []
-        for word in game_data['all_possible_words']:
-            if word not in game_data['found_words']:
-                self.missed_words.append(word)
+        self.analysis = get_post_game_analyser().analyse(game_data)
+        self.missed_words = self.analysis.missed
 
         self.initUI()
 
@@ -129,11 +128,7 @@ class AnalyticsWindow(QWidget):
             font-weight: bold;
             color: #f44336;
         """)
-        if self.game_data['all_possible_words']:
-            percentage = (len(self.game_data['found_words']) /
-                        len(self.game_data['all_possible_words']) * 100)
-        else:
-            percentage = 0
+        percentage = self.analysis.completion
 
         percent_stat = QLabel(f"Completion:\n{percentage:.1f}%")
         percent_stat.setAlignment(Qt.AlignCenter)
@@ -150,6 +145,19 @@ class AnalyticsWindow(QWidget):
         stats_layout.addWidget(missed_stat)
         stats_layout.addWidget(percent_stat)
 
+        longest = self.analysis.longest_missed.lower() if self.analysis.longest_missed else 'none'
+        rarity_text = '   '.join(f"{label}: {found}/{found + missed}" for label, found, missed in self.analysis.rarity)
+        insight_label = QLabel(f"Points left on the board: {self.analysis.points_left}   •   "
+                               f"Longest missed word: {longest}\nFound by rarity:   {rarity_text}")
+        insight_label.setAlignment(Qt.AlignCenter)
+        insight_label.setStyleSheet("""
+            background-color: white;
+            padding: 10px;
+            border-radius: 10px;
+            font-size: 14px;
+            color: #333;
+        """)
+
         missed_label = QLabel('Missed Words:')
         missed_label.setStyleSheet("""
             font-size: 18px; 
@@ -159,7 +167,7 @@ class AnalyticsWindow(QWidget):
         """)
 
         if self.missed_words:
-            missed_text = ', '.join(sorted(self.missed_words))
+            missed_text = ', '.join(self.missed_words)
         else:
             missed_text = ''
         missed_display = QLabel(missed_text)
@@ -222,6 +230,7 @@ class AnalyticsWindow(QWidget):
         main_layout.addWidget(self.message_label)
         main_layout.addWidget(score_label)
         main_layout.addLayout(stats_layout)
+        main_layout.addWidget(insight_label)
         main_layout.addWidget(missed_label)
         main_layout.addWidget(scroll_area)
         main_layout.addStretch()
@@ -272,21 +281,14 @@ class AnalyticsWindow(QWidget):
     def save_game(self):
         try:
             self.game_data['timestamp'] = datetime.now().isoformat()
-            try:
-                with open('data/game_history.json', 'r') as f:
-                    games = json.load(f)
-            except:
-                games = []
-
-            games.append(self.game_data)
-            with open('data/game_history.json', 'w') as f:
-                json.dump(games, f, indent=2)
+            game_id = get_history_store().add(self.game_data)
+            get_post_game_analyser().remember(game_id, self.analysis)
 
             self.show_success_message("Game saved successfully!")
             QTimer.singleShot(1000, self.return_to_menu)
 
-        except Exception:
-            self.show_error_message(f"Failed to save game: {str(Exception)}")
+        except (OSError, TypeError, ValueError) as e:
+            self.show_error_message(f"Failed to save game: {e}")
 
     def delete_game(self):
         dialog = DeleteGameDialog(self)
@@ -0,0 +1,121 @@
+import threading
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from modules.frequencyIndex import get_frequency_index
+
+'''
+This file holds the Qt workers that run slow jobs away from the GUI thread.
+Each worker is a QObject moved onto its own QThread. Results come back through
+Qt signals, which Qt delivers on the GUI thread, so slots can update widgets safely.
+
+BoardGenerationWorker Class:
+Signals:
+ - progress(int, int) - (attempt, max_attempts) after each candidate board is solved
+ - finished(object) - BoardResult once the board is ready (letters, words with paths, scores)
+ - failed(str) - Error message if generation raised an exception
+Key Methods:
+ - __init__(self, board_gen, board_pool=None, validator=None):
+        - board_gen - BoardGenerator for the chosen size and difficulty
+        - board_pool - Optional BoardPool, a ready-made board is taken from it instead
+        - validator - The game's dictionary (the shared one if None)
+ - run(self):
+        - Runs on the worker thread, takes or generates the board (which also solves it)
+        - Also loads the dictionary's frequency index (building it the first time, about a
+          second), so hints and the post-game analysis only read it on the GUI thread
+
+AISuggestionWorker Class:
+Signals:
+ - finished(object, object, bool) - (word, path, complete), word and path are None if nothing was found,
+        complete is False when the time limit or cancel() cut the search short (best word so far)
+ - failed(str) - Error message if the search raised an exception
+Key Methods:
+ - __init__(self, ai_helper, board, found_words, time_limit=1.0):
+        - found_words is copied, so the game can keep adding words while the search runs
+ - run(self):
+        - Runs AIHelper.find_candidates with the time limit, then picks the suggestion
+ - cancel(self):
+        - Safe to call from the GUI thread, the search stops before its next start tile
+
+Module Functions:
+ - start_worker(worker):
+        - Creates a QThread, moves the worker onto it and starts worker.run()
+        - The thread quits and the worker is cleaned up when it finishes or fails
+        - The thread is kept in _running_threads until it has finished, so a window that
+          closes (and is garbage collected) while its worker runs never destroys a running QThread
+        - Returns the QThread
+'''
+
+
+class BoardGenerationWorker(QObject):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, board_gen, board_pool=None, validator=None):
+        super().__init__()
+        self.board_gen = board_gen
+        self.board_pool = board_pool
+        self.validator = validator
+
+    def run(self):
+        try:
+            if self.board_pool is not None:
+                result = self.board_pool.take(self.board_gen.size, self.board_gen.difficulty,
+                                              progress_callback=self.progress.emit)
+            else:
+                result = self.board_gen.generate(progress_callback=self.progress.emit)
+            get_frequency_index(self.validator)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(result)
+
+
+class AISuggestionWorker(QObject):
+    finished = pyqtSignal(object, object, bool)
+    failed = pyqtSignal(str)
+
+    def __init__(self, ai_helper, board, found_words, time_limit=1.0):
+        super().__init__()
+        self.ai_helper = ai_helper
+        self.board = board
+        self.found_words = set(found_words)
+        self.time_limit = time_limit
+        self._cancelled = threading.Event()
+
+    def run(self):
+        try:
+            candidates, complete = self.ai_helper.find_candidates(
+                self.board, self.found_words, self.time_limit, self._cancelled.is_set)
+            word, path = self.ai_helper.choose(candidates)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(word, path, complete)
+
+    def cancel(self):
+        self._cancelled.set()
+
+
+# Every QThread start_worker() started that has not finished yet
+_running_threads = set()
+
+
+def _release_thread(thread):
+    # finished is sent just before the thread really stops, so wait for it first
+    thread.wait()
+    _running_threads.discard(thread)
+
+
+def start_worker(worker):
+    thread = QThread()
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    worker.finished.connect(thread.quit)
+    worker.failed.connect(thread.quit)
+    thread.finished.connect(worker.deleteLater)
+    # Keep the worker alive for as long as its thread is running
+    thread.worker = worker
+    _running_threads.add(thread)
+    thread.finished.connect(lambda: _release_thread(thread))
+    thread.start()
+    return thread
@@ -1,5 +1,7 @@
 import random
 from modules.wordFinder import WordFinder
+from modules.difficultyEstimator import get_strategy
+from modules.boardSearch import BoardAnnealer
 
 '''
 This file generates a Boggle board using real dice configurations. 
@@ -8,7 +10,10 @@ We use wordFinder to validate if there are enough words in the board generated m
 Key Attributes:
  - self.size - Grid dimensions (4 for classic, 5 for big)
  - self.difficulty - String value of 'Easy', 'Medium', or 'Hard'
- - self.word_finder - WordFinder instance to analyse generated boards
+ - self.word_finder - WordFinder instance to analyse generated boards (shares the process-wide dictionary)
+ - self.pool - Optional SolverPool, candidate boards are then solved on several processes
+ - self.strategy - How candidates are checked, see difficultyEstimator.py ('full', 'early_exit' or 'prefilter')
+ - self.search - 'random' (re-roll whole boards) or 'anneal' (improve one board, see boardSearch.py)
  
 Constants (These are static data fixed for this file):
  - CLASSIC_DICE - Array of 16 Boggle dice, each containing 6 letters
@@ -18,18 +23,46 @@ Constants (These are static data fixed for this file):
  - This ensure generations have higher chance creating more words 
  
 Key Methods:
- - __init__(self, size=4, difficulty='Easy'):
+ - __init__(self, size=4, difficulty='Easy', pool=None, strategy='early_exit', search='random'):
         - Constructor that initialises the parameters
         - size - Grid size (4 or 5)
         - difficulty - String value of 'Easy' or 'Medium' or 'Hard'
- - generate(self):
+        - pool - Optional SolverPool passed on to the WordFinder
+        - strategy - Name from difficultyEstimator.STRATEGIES or a strategy object
+        - search - 'random' or 'anneal'
+ - generate(self, progress_callback=None):
         - Creates a board that meets the specified difficulty
+        - Returns a BoardResult, which already holds every word on the board and its path
+        - progress_callback(attempt, max_attempts) is called after each candidate is checked
         - We loop through 50 times to generate the suitable board
         - We use dice-based generation for 4x4/5x5
         - In case this doesn't work, we fall back to randomising the board
         - We count the words using WordFinder
         - We ensure the word present matches the difficulty level
         - We return the first suitable board or final attempt if none qualified
+        - Candidates are solved as one batch with WordFinder.solve_many, which reuses the solver
+        - The strategy can skip hopeless candidates and stop each solve once the answer is known
+        - Only the chosen board is solved in full
+ - screened_candidates(self, max_attempts):
+        - Generator of rolled boards that the strategy's should_solve() accepts
+ - complete_result(self, summary, attempts, meets_difficulty):
+        - Turns a solve summary into a BoardResult
+        - If the search stopped early it is resumed (or re-solved when it ran on a SolverPool)
+        - The finished board goes into the solve cache
+ - generate_targeted(self, target_words=None, target_score=None, max_solves=500):
+        - Optimisation mode (see boardSearch.py), changes one die at a time until the target is hit
+        - Only for sizes with dice (4x4 and 5x5), raises ValueError for other sizes
+        - Targets can be exact word counts, word count ranges or score totals
+        - generate() uses it with the difficulty band when search='anneal'
+ - remember(self, result):
+        - Stores a finished BoardResult in the solve cache (see solveCache.py)
+ - dice(self):
+        - CLASSIC_DICE for 4x4, BIG_DICE for 5x5, None for other sizes
+ - generate_in_band(self, progress_callback=None):
+        - Calls generate() again until the board meets the difficulty, at most MAX_BAND_ROUNDS times
+        - If no round hits the band, returns the board closest to it (meets_difficulty is False)
+ - generate_candidate(self):
+        - Rolls one board using the dice for this size (or random letters for other sizes)
         
  - generate_from_dice(self, dice):
         - This creates board using real Boggle dice mechanics
@@ -44,6 +77,10 @@ Key Methods:
         - Includes 'Qu' as a single tile
         - We must have fallback logic in case Main method fails
         
+ - difficulty_band(self):
+        - Returns the (lowest, highest) word counts for the chosen difficulty (highest is exclusive)
+ - band_distance(self, word_count):
+        - How many words a board is outside the difficulty band (0 inside it)
  - meets_difficulty(self, word_count):
         - Determines if a board has appropriate number of words for chosen difficulty
         - We implement Difficulty Thresholds:
@@ -56,15 +93,65 @@ Key Methods:
             - Medium: 100-149 words
             - Hard: <100 words
             
+BoardResult Class:
+ - Everything the game needs about a generated board, so it never has to solve it again
+ - self.letters - 2D list of tiles
+ - self.words - Dictionary mapping each word to its path of (row, col) tiles
+ - self.word_count - Number of words on the board
+ - self.max_score - Total points if every word is found
+ - self.solve_time - Seconds spent solving this board
+ - self.attempts - Number of candidate boards checked (over every round, for generate_in_band)
+ - self.meets_difficulty - False if generate() gave up and returned the last attempt
+ - sorted_words(self) - Sorted list of the words (the old find_all_words() result)
+ - to_dict(self) / from_dict(cls, data) - Convert to and from plain JSON data (used by boardPool.py)
+
  Algorithm Flow: 
     - generate() called
     - Loop up to 50 times
-    - generate_from_dice() 
-    - WordFinder.find_all_words() 
+    - generate_candidate() -> generate_from_dice() 
+    - WordFinder.solve_many() 
     - meets_difficulty() 
     - Return if suitable
     
  '''
+
+# generate() calls generate_in_band() makes before it settles for the closest board
+MAX_BAND_ROUNDS = 10
+
+
+class BoardResult:
+    def __init__(self, letters, words, max_score, solve_time, attempts=1, meets_difficulty=True):
+        self.letters = letters
+        self.words = words
+        self.word_count = len(words)
+        self.max_score = max_score
+        self.solve_time = solve_time
+        self.attempts = attempts
+        self.meets_difficulty = meets_difficulty
+
+    @classmethod
+    def from_summary(cls, summary, attempts, meets_difficulty):
+        return cls(summary.board, summary.words, summary.total_score, summary.solve_time,
+                   attempts, meets_difficulty)
+
+    def sorted_words(self):
+        return sorted(self.words)
+
+    def to_dict(self):
+        return {
+            'letters': self.letters,
+            'words': self.words,
+            'max_score': self.max_score,
+            'solve_time': self.solve_time,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        # JSON turns the (row, col) tuples into lists, so turn them back
+        words = {word: [tuple(cell) for cell in path] for word, path in data['words'].items()}
+        return cls(data['letters'], words, data['max_score'], data.get('solve_time', 0.0))
+
+
 class BoardGenerator:
     """Generates Boggle boards based on Boggle Dice"""
 
@@ -85,30 +172,114 @@ class BoardGenerator:
         "FIPRSY", "GORRVW", "HIPRRY", "NOOTUW", "OOOTTU"
     ]
 
-    def __init__(self, size=4, difficulty='Easy'):
+    def __init__(self, size=4, difficulty='Easy', pool=None, strategy='early_exit', search='random'):
         self.size = size
         self.difficulty = difficulty
-        self.word_finder = WordFinder()
+        self.pool = pool
+        self.strategy = get_strategy(strategy)
+        self.search = search
+        self.word_finder = WordFinder(pool=pool)
+
+    def generate(self, progress_callback=None):
+        if self.search == 'anneal' and self.dice() is not None:
+            return self.generate_targeted(target_words=self.difficulty_band())
 
-    def generate(self):
         max_attempts = 50
 
-        for attempt in range(max_attempts):
-            if self.size == 4:
-                board = self.generate_from_dice(self.CLASSIC_DICE)
-            elif self.size == 5:
-                board = self.generate_from_dice(self.BIG_DICE)
+        # The strategy may stop each solve early, as soon as the difficulty decision is known
+        word_limit = self.strategy.word_limit(self)
+        candidates = self.screened_candidates(max_attempts)
+        summary = None
+        for summary in self.word_finder.solve_many(candidates, word_limit=word_limit, include_words=True):
+            if progress_callback is not None:
+                progress_callback(summary.index + 1, max_attempts)
+            if self.meets_difficulty(summary.word_count):
+                print(f"Board generated with {summary.word_count}{'' if summary.complete else '+'} words "
+                      f"(Difficulty: {self.difficulty})")
+                return self.complete_result(summary, summary.index + 1, True)
 
-            else: # Generate from random function (This was used for testing)
-                board = self.generate_random()
+        print(f"Warning: Could not generate board meeting {self.difficulty} difficulty")
+        if summary is None:
+            # The prefilter rejected every roll, so fall back to one unchecked board
+            summary = next(self.word_finder.solve_many([self.generate_candidate()], include_words=True))
+        return self.complete_result(summary, summary.index + 1, False)
 
-            word_count = len(self.word_finder.find_all_words(board))
-            if self.meets_difficulty(word_count):
-                print(f"Board generated with {word_count} words (Difficulty: {self.difficulty})")
-                return board
+    def screened_candidates(self, max_attempts):
+        """Rolls boards, passing on at most max_attempts that the strategy wants solved"""
+        passed = 0
+        rolls = 0
+        while passed < max_attempts and rolls < max_attempts * 20:
+            board = self.generate_candidate()
+            rolls += 1
+            if self.strategy.should_solve(self, board):
+                passed += 1
+                yield board
 
-        print(f"Warning: Could not generate board meeting {self.difficulty} difficulty")
-        return board
+    def complete_result(self, summary, attempts, meets_difficulty):
+        """BoardResult with every word, finishing the solve if it stopped early"""
+        if not summary.complete:
+            if summary.resume is not None:
+                summary = summary.resume()
+            else:
+                summary = next(self.word_finder.solve_many([summary.board], include_words=True))
+        result = BoardResult.from_summary(summary, attempts, meets_difficulty)
+        self.remember(result)
+        return result
+
+    def generate_targeted(self, target_words=None, target_score=None, max_solves=500):
+        """Anneal one dice board towards a word count or score, exact or as a (lowest, highest) range"""
+        if self.dice() is None:
+            # Annealing changes one die at a time, other sizes have no dice to change
+            raise ValueError(f"Targeted search needs a dice set, there is none for {self.size}x{self.size} boards")
+        if target_words is None and target_score is None:
+            target_words = self.difficulty_band()
+        annealer = BoardAnnealer(self, target_words=target_words, target_score=target_score,
+                                 max_solves=max_solves)
+        result = annealer.search()
+        self.remember(result)
+        print(f"Targeted board with {result.word_count} words, {result.max_score} points "
+              f"after {result.attempts} solves")
+        return result
+
+    def remember(self, result):
+        """Put a finished board in the solve cache, so the game and analytics never solve it again"""
+        if self.word_finder.cache is not None:
+            self.word_finder.cache.put(result.letters, result.words)
+
+    def dice(self):
+        """The dice set for this size, or None when boards use random letters"""
+        if self.size == 4:
+            return self.CLASSIC_DICE
+        elif self.size == 5:
+            return self.BIG_DICE
+        return None
+
+    def generate_in_band(self, progress_callback=None):
+        """Keep generating until a board really meets the difficulty, or give the closest one"""
+        closest = None
+        attempts = 0
+        for _ in range(MAX_BAND_ROUNDS):
+            result = self.generate(progress_callback)
+            # Every round's boards count towards the one returned
+            attempts += result.attempts
+            if result.meets_difficulty:
+                result.attempts = attempts
+                return result
+            if closest is None or self.band_distance(result.word_count) < self.band_distance(closest.word_count):
+                closest = result
+        print(f"Warning: No board met {self.difficulty} difficulty in {MAX_BAND_ROUNDS} rounds, "
+              f"using the closest ({closest.word_count} words)")
+        closest.meets_difficulty = False
+        closest.attempts = attempts
+        return closest
+
+    def generate_candidate(self):
+        if self.size == 4:
+            return self.generate_from_dice(self.CLASSIC_DICE)
+        elif self.size == 5:
+            return self.generate_from_dice(self.BIG_DICE)
+        else: # Generate from random function (This was used for testing)
+            return self.generate_random()
 
     def generate_from_dice(self, dice):
         """Generate board using Boggle dice"""
@@ -149,21 +320,35 @@ class BoardGenerator:
             board.append(board_row)
         return board
 
-    def meets_difficulty(self, word_count):
-        """Check if word count meets difficulty threshold"""
+    def difficulty_band(self):
+        """(lowest, highest) word count for this difficulty, highest is exclusive and None means no limit"""
         if self.size == 4:
             if self.difficulty == 'Easy':
-                return word_count >= 80
+                return (80, None)
             elif self.difficulty == 'Medium':
-                return 50 <= word_count < 80
+                return (50, 80)
             elif self.difficulty == 'Hard':
-                return word_count < 50
+                return (0, 50)
         elif self.size == 5:
             # Adjust for 5x5 grid
             if self.difficulty == 'Easy':
-                return word_count >= 150
+                return (150, None)
             elif self.difficulty == 'Medium':
-                return 100 <= word_count < 150
+                return (100, 150)
             elif self.difficulty == 'Hard':
-                return word_count < 100
-        return True
+                return (0, 100)
+        return (0, None)
+
+    def band_distance(self, word_count):
+        """Words short of the lowest count, or over the highest, 0 inside the band"""
+        lowest, highest = self.difficulty_band()
+        if word_count < lowest:
+            return lowest - word_count
+        if highest is not None and word_count >= highest:
+            return word_count - highest + 1
+        return 0
+
+    def meets_difficulty(self, word_count):
+        """Check if word count meets difficulty threshold"""
+        lowest, highest = self.difficulty_band()
+        return word_count >= lowest and (highest is None or word_count < highest)
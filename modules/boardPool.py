@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+from collections import deque
+from modules.boardGen import BoardGenerator, BoardResult
+from modules.solveCache import dictionary_tag
+
+'''
+This file keeps a stock of ready-made boards for every grid size and difficulty,
+so starting a game does not have to wait for BoardGenerator.
+
+Every board in the pool has already been solved and checked against the
+difficulty, so a board taken from stock is always in the right band.
+The stock is saved to data/board_pool.json, so boards made during one session
+are used by the next one. The file names the word list the boards were solved
+with (solveCache.dictionary_tag), and a file made with another word list is
+ignored. take() saves the file straight away, so a board that has been handed
+out is never handed out again by the next session.
+
+A background producer thread watches the stock. When a (grid_size, difficulty)
+stock drops below low_water boards, it generates boards until there are
+target_stock again, then saves the file.
+
+Key Attributes:
+ - self.path - JSON file the stock is saved in
+ - self.target_stock - Number of boards the producer aims to keep for each combination
+ - self.low_water - The producer starts refilling when a stock drops below this
+ - self.stock - Dictionary mapping (grid_size, difficulty) to a deque of BoardResults
+ - self.dictionary - Name of the word list the boards were solved with
+
+Key Methods:
+ - take(self, size, difficulty, progress_callback=None):
+        - Pops the oldest board when there is stock, saves the pool and wakes the producer
+        - If the stock is empty, generates one board straight away with BoardGenerator.generate_in_band
+          (the closest board, with meets_difficulty False, if none hits the band)
+ - count(self, size, difficulty):
+        - Number of boards in stock
+ - refill(self, size, difficulty):
+        - Generates boards until that stock reaches target_stock (used by the producer)
+        - Stops early if generate_in_band() cannot hit the band, so the producer never spins on it
+ - start(self) / stop(self):
+        - Starts or stops the background producer thread
+ - load(self) / save(self):
+        - Reads or writes data/board_pool.json, saving writes a temporary file and renames it
+
+Module Functions:
+ - get_board_pool():
+        - Returns the process-wide BoardPool, starting its producer the first time
+'''
+
+GRID_SIZES = (4, 5)
+DIFFICULTIES = ('Easy', 'Medium', 'Hard')
+
+
+class BoardPool:
+    def __init__(self, path='data/board_pool.json', target_stock=10, low_water=3, dictionary=None):
+        self.path = path
+        self.dictionary = dictionary
+        self.target_stock = target_stock
+        self.low_water = low_water
+        self.stock = {(size, difficulty): deque() for size in GRID_SIZES for difficulty in DIFFICULTIES}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self._dirty = False
+        self.load()
+
+    def take(self, size, difficulty, progress_callback=None):
+        key = (size, difficulty)
+        with self._lock:
+            boards = self.stock.setdefault(key, deque())
+            result = boards.popleft() if boards else None
+            self._dirty = True
+        self._wake.set()
+        if result is not None:
+            # Saved now, the producer may not get to it before the game exits
+            self.save()
+            return result
+        # Nothing in stock yet, so make one now
+        return BoardGenerator(size, difficulty).generate_in_band(progress_callback)
+
+    def count(self, size, difficulty):
+        with self._lock:
+            return len(self.stock.get((size, difficulty), ()))
+
+    def refill(self, size, difficulty):
+        generator = BoardGenerator(size, difficulty)
+        while self._running and self.count(size, difficulty) < self.target_stock:
+            result = generator.generate_in_band()
+            if not result.meets_difficulty:
+                # Only in-band boards are stocked, try this band again the next time the producer wakes
+                break
+            with self._lock:
+                self.stock.setdefault((size, difficulty), deque()).append(result)
+                self._dirty = True
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._produce, name='BoardPoolProducer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _produce(self):
+        while self._running:
+            for size, difficulty in list(self.stock):
+                if not self._running:
+                    break
+                if self.count(size, difficulty) < self.low_water:
+                    self.refill(size, difficulty)
+            if self._dirty:
+                self.save()
+            self._wake.wait()
+            self._wake.clear()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load board pool: {e}")
+            return
+        if data.get('dictionary') != self.dictionary:
+            # Solved with another word list, the words and scores no longer hold
+            print("Board pool was made with another dictionary, starting a new one")
+            return
+        with self._lock:
+            for entry in data.get('stocks', []):
+                key = (entry['grid_size'], entry['difficulty'])
+                self.stock[key] = deque(BoardResult.from_dict(board) for board in entry['boards'])
+
+    def save(self):
+        # take() and the producer both save, one at a time so the newest stock is written last
+        with self._save_lock:
+            with self._lock:
+                data = {'dictionary': self.dictionary, 'stocks': [
+                    {'grid_size': size, 'difficulty': difficulty,
+                     'boards': [result.to_dict() for result in boards]}
+                    for (size, difficulty), boards in self.stock.items()
+                ]}
+                self._dirty = False
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump(data, f)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"Could not save board pool: {e}")
+
+
+_board_pool = None
+_board_pool_lock = threading.Lock()
+
+
+def get_board_pool():
+    global _board_pool
+    with _board_pool_lock:
+        if _board_pool is None:
+            _board_pool = BoardPool(dictionary=dictionary_tag())
+            _board_pool.start()
+        return _board_pool
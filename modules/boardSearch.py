@@ -0,0 +1,150 @@
+import math
+import random
+from modules.solverEngine import BoardSolver
+
+'''
+This file finds boards for a target by improving one board step by step
+(simulated annealing), instead of rolling whole new boards until one fits.
+
+The board always follows real dice rules: each cell holds one of the dice from
+CLASSIC_DICE / BIG_DICE showing one of its six faces, and every die is used once.
+Each step makes one small change:
+ - Turn one die to a different face, or
+ - Swap the positions of two dice (each keeps its face)
+Only the changed tiles are re-solved (BoardSolver.update), the words elsewhere
+on the board are carried over, and the result is compared with the target. Better boards are always
+kept, worse boards are kept with probability exp(-change / temperature), so the
+search can climb out of dead ends early on. The temperature falls every step.
+
+A target can be:
+ - A word count range (lowest, highest), highest exclusive and None for no limit
+ - An exact word count (int)
+ - A total score (exact int or range) when target_score is used instead
+
+DiceLayout Class:
+Key Attributes:
+ - self.dice - The dice set (list of 6-letter strings)
+ - self.order - Which die sits on each cell
+ - self.faces - Which face (0-5) each die shows
+Key Methods:
+ - roll(cls, dice, size) - Random layout, like BoardGenerator.generate_from_dice
+ - letters(self) - 2D board of letters ('Q' becomes 'Qu')
+ - mutate(self) - Returns (new layout, changed (row, col) cells) after one random change
+
+BoardAnnealer Class:
+Key Attributes:
+ - self.generator - BoardGenerator that provides the size, dice and solver
+ - self.target_words / self.target_score - The target (only one is used)
+ - self.max_solves - Give up after this many solves
+ - self.temperature / self.cooling - Annealing schedule
+Key Methods:
+ - distance(self, result) - 0 when the board hits the target, otherwise how far away it is
+ - search(self) - Runs the search and returns a BoardResult (meets_difficulty tells whether it hit)
+'''
+
+
+class DiceLayout:
+    def __init__(self, dice, size, order, faces):
+        self.dice = dice
+        self.size = size
+        self.order = order
+        self.faces = faces
+
+    @classmethod
+    def roll(cls, dice, size):
+        order = list(range(len(dice)))
+        random.shuffle(order)
+        order = order[:size * size]
+        faces = [random.randrange(len(dice[die])) for die in order]
+        return cls(dice, size, order, faces)
+
+    def letters(self):
+        board = []
+        for row in range(self.size):
+            board_row = []
+            for col in range(self.size):
+                cell = row * self.size + col
+                letter = self.dice[self.order[cell]][self.faces[cell]]
+                board_row.append('Qu' if letter == 'Q' else letter)
+            board.append(board_row)
+        return board
+
+    def mutate(self):
+        order = self.order.copy()
+        faces = self.faces.copy()
+        if random.random() < 0.5:
+            cell = random.randrange(len(order))
+            die = self.dice[order[cell]]
+            faces[cell] = random.choice([face for face in range(len(die)) if die[face] != die[faces[cell]]]
+                                        or [faces[cell]])
+            changed = [divmod(cell, self.size)]
+        else:
+            first, second = random.sample(range(len(order)), 2)
+            order[first], order[second] = order[second], order[first]
+            faces[first], faces[second] = faces[second], faces[first]
+            changed = [divmod(first, self.size), divmod(second, self.size)]
+        return DiceLayout(self.dice, self.size, order, faces), changed
+
+
+class BoardAnnealer:
+    def __init__(self, generator, target_words=None, target_score=None, max_solves=500,
+                 temperature=1.0, cooling=0.98):
+        self.generator = generator
+        self.target_words = target_words
+        self.target_score = target_score
+        self.max_solves = max_solves
+        self.temperature = temperature
+        self.cooling = cooling
+        self.solver = BoardSolver(generator.word_finder.validator.trie)
+        self.solves = 0
+
+    def _target(self):
+        return self.target_score if self.target_score is not None else self.target_words
+
+    def distance(self, result):
+        value = result.total_score() if self.target_score is not None else result.word_count()
+        target = self._target()
+        if isinstance(target, int):
+            return abs(value - target)
+        lowest, highest = target
+        if value < lowest:
+            return lowest - value
+        if highest is not None and value >= highest:
+            return value - highest + 1
+        return 0
+
+    def _scale(self):
+        """Size of a 'typical' step in the target's units, so temperatures work for any target"""
+        target = self._target()
+        if isinstance(target, int):
+            middle = target
+        else:
+            lowest, highest = target
+            middle = (lowest + highest) / 2 if highest is not None else lowest
+        return max(1.0, middle * 0.1)
+
+    def search(self):
+        from modules.boardGen import BoardResult
+        dice = self.generator.dice()
+        layout = DiceLayout.roll(dice, self.generator.size)
+        result = self.solver.update(None, layout.letters(), ())
+        self.solves = 1
+        distance = self.distance(result)
+        best_result, best_distance = result, distance
+        temperature = self.temperature
+        scale = self._scale()
+
+        while best_distance > 0 and self.solves < self.max_solves:
+            candidate, changed = layout.mutate()
+            candidate_result = self.solver.update(result, candidate.letters(), changed)
+            self.solves += 1
+            candidate_distance = self.distance(candidate_result)
+            change = (candidate_distance - distance) / scale
+            if change <= 0 or random.random() < math.exp(-change / max(temperature, 1e-6)):
+                layout, result, distance = candidate, candidate_result, candidate_distance
+                if distance < best_distance:
+                    best_result, best_distance = result, distance
+            temperature *= self.cooling
+
+        return BoardResult.from_summary(best_result.summary(include_words=True), self.solves,
+                                        best_distance == 0)
@@ -0,0 +1,67 @@
+from functools import lru_cache
+
+'''
+This file describes the shape of a Boggle board once, so searches never have to
+work out neighbours or bounds-check while they run.
+
+Cells are numbered row by row: cell = row * cols + col
+A set of visited cells is stored as one integer, bit 'cell' is set when that
+cell is on the current path. Testing, adding and removing a cell are single
+integer operations, and there is no visited grid to build for each start cell.
+
+BoardTopology Class:
+Key Attributes:
+ - self.rows, self.cols - Board dimensions
+ - self.cell_count - rows * cols
+ - self.neighbours - Tuple with one entry per cell, each a tuple of the adjacent cells
+        - Only cells inside the board are listed, so no bounds checks are needed
+ - self.coords - Tuple mapping each cell to its (row, col) pair
+ - self.bits - Tuple mapping each cell to its bitmask (1 << cell)
+
+Key Methods:
+ - index(self, row, col):
+        - Converts (row, col) into a cell number
+ - flatten(self, board):
+        - Converts a 2D board into a flat list of tiles in cell order
+ - path_to_coords(self, cells):
+        - Converts a list of cell numbers back into (row, col) pairs for the UI
+
+Module Functions:
+ - get_topology(rows, cols=None):
+        - Returns the shared BoardTopology for this size, building it on first use
+        - cols defaults to rows for square boards
+'''
+
+DIRECTIONS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class BoardTopology:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.cell_count = rows * cols
+        self.coords = tuple((cell // cols, cell % cols) for cell in range(self.cell_count))
+        self.bits = tuple(1 << cell for cell in range(self.cell_count))
+        neighbours = []
+        for row, col in self.coords:
+            adjacent = []
+            for dr, dc in DIRECTIONS:
+                new_row, new_col = row + dr, col + dc
+                if 0 <= new_row < rows and 0 <= new_col < cols:
+                    adjacent.append(new_row * cols + new_col)
+            neighbours.append(tuple(adjacent))
+        self.neighbours = tuple(neighbours)
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def flatten(self, board):
+        return [letter for board_row in board for letter in board_row]
+
+    def path_to_coords(self, cells):
+        return [self.coords[cell] for cell in cells]
+
+
+@lru_cache(maxsize=None)
+def get_topology(rows, cols=None):
+    return BoardTopology(rows, rows if cols is None else cols)
@@ -1,13 +1,15 @@
 import sys
 from math import floor
-from PyQt5.QtWidgets import QApplication, QWidget, QGridLayout, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, \
+from PyQt5.QtWidgets import QWidget, QGridLayout, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, \
     QMessageBox, QDialog
 from PyQt5.QtCore import Qt, QTimer
 from modules.boardGen import BoardGenerator
-from modules.validation import WordValidator
-from modules.wordFinder import WordFinder
+from modules.boardPool import get_board_pool
+from modules.dictionaryRegistry import get_validator
 from modules.analyticsWindow import AnalyticsWindow
 from modules.aiHelper import AIHelper
+from modules.hintService import HintService
+from modules.backgroundWorkers import AISuggestionWorker, BoardGenerationWorker, start_worker
 
 
 class TileButton(QPushButton):
@@ -154,24 +156,33 @@ class BoggleGame(QWidget):
         self.current_word = ""
         self.found_words = []
         self.all_possible_words = []
+        self.board_result = None
+        self.hint_service = None
         self.score = 0
         self.is_dragging = False
         self.ai_helper_uses = 0
 
         self.ai_cooldown_time = 20  # 20 seconds
+        self.ai_time_limit = 1.0  # Seconds before a beam search gives its best word so far
+        self.ai_worker = None
+        self.ai_thread = None
         self.ai_cooldown_remaining = 0
         self.ai_cooldown_timer = None
         self.ai_highlighted_path = []
+        self.board_ready = False
+        self.game_over = False
+        self.generation_thread = None
 
         self.board_gen = BoardGenerator(self.grid_size, self.difficulty)
-        self.validator = WordValidator()
-        self.word_finder = WordFinder()
-        self.ai_helper = AIHelper() if self.ai_helper_enabled else None
+        # Ready-made boards, refilled in the background, so games start straight away
+        self.board_pool = get_board_pool()
+        # Every component shares one dictionary, so it is only loaded once per process
+        self.validator = get_validator()
+        self.ai_helper = AIHelper(self.validator) if self.ai_helper_enabled else None
 
         self.initUI()
+        # The timer starts in show_board(), once the board has been generated in the background
         self.generate_board()
-        if self.timer_seconds > 0:
-            self.start_timer()
 
     def parse_timer(self, timer_str):
         if timer_str == "Off":
@@ -245,6 +256,14 @@ class BoggleGame(QWidget):
         board_container.setLayout(self.board_layout)
         board_container.setMaximumSize(500, 500)
 
+        self.loading_label = QLabel('Generating board...')
+        self.loading_label.setAlignment(Qt.AlignCenter)
+        self.loading_label.setStyleSheet("""
+            font-size: 20px;
+            color: #666;
+            padding: 20px;
+        """)
+
         self.words_label = QLabel('Found Words:')
         self.words_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #333;")
         self.words_display = QLabel('')
@@ -299,6 +318,7 @@ class BoggleGame(QWidget):
         main_layout.addLayout(top_bar)
         main_layout.addWidget(self.score_label)
         main_layout.addWidget(self.word_display)
+        main_layout.addWidget(self.loading_label)
         main_layout.addWidget(board_container, alignment=Qt.AlignCenter)
         main_layout.addWidget(self.words_label)
         main_layout.addWidget(self.words_display)
@@ -311,8 +331,38 @@ class BoggleGame(QWidget):
         self.setMouseTracking(True)
 
     def generate_board(self):
-        self.board_letters = self.board_gen.generate()
-        self.all_possible_words = self.word_finder.find_all_words(self.board_letters)
+        """Generate and solve the board on a worker thread, so the window stays responsive"""
+        self.board_ready = False
+        self.loading_label.setText('Generating board...')
+        self.loading_label.show()
+        if self.ai_helper_enabled:
+            self.ai_helper_btn.setEnabled(False)
+        worker = BoardGenerationWorker(self.board_gen, self.board_pool, self.validator)
+        worker.progress.connect(self.update_generation_progress)
+        worker.finished.connect(self.show_board)
+        worker.failed.connect(self.board_generation_failed)
+        self.generation_thread = start_worker(worker)
+
+    def update_generation_progress(self, attempt, max_attempts):
+        self.loading_label.setText(f'Generating board... (checked {attempt}/{max_attempts})')
+
+    def board_generation_failed(self, message):
+        self.loading_label.setText(f'Could not generate a board: {message}')
+
+    def show_board(self, result):
+        if self.game_over:
+            return  # The game already ended while the board was being generated
+        # The generator already solved this board, so the result is used directly
+        self.board_result = result
+        self.board_letters = result.letters
+        self.all_possible_words = result.sorted_words()
+        # AI hints come straight from the solution, ranked once per board
+        if self.ai_helper_enabled and result.words:
+            self.hint_service = HintService(result.words, validator=self.validator)
+        self.board_ready = True
+        self.loading_label.hide()
+        if self.ai_helper_enabled and self.ai_cooldown_remaining <= 0:
+            self.ai_helper_btn.setEnabled(True)
 
         # Clear existing tiles
         for i in reversed(range(self.board_layout.count())):
@@ -330,19 +380,47 @@ class BoggleGame(QWidget):
                 tile_row.append(tile)
             self.tiles.append(tile_row)
 
+        if self.timer_seconds > 0:
+            self.start_timer()
+
     def use_ai_helper(self):
-        if self.ai_cooldown_remaining > 0:
+        if self.ai_cooldown_remaining > 0 or not self.board_ready:
+            return
+
+        found_words = set(w.upper() for w in self.found_words)
+        if self.hint_service is not None:
+            self.handle_ai_suggestion(*self.hint_service.next_hint(found_words))
             return
 
+        # No solution to rank (should not happen with generated boards), fall back to the beam search,
+        # which runs on a worker thread so the window keeps responding
         self.ai_helper_btn.setEnabled(False)
         self.ai_helper_btn.setText('Searching...')
-        QApplication.processEvents()
-        word, path = self.ai_helper.suggest_word(
-            self.board_letters,
-            set(w.upper() for w in self.found_words)
-        )
+        worker = AISuggestionWorker(self.ai_helper, self.board_letters, found_words, self.ai_time_limit)
+        worker.finished.connect(self.ai_suggestion_ready)
+        worker.failed.connect(self.ai_suggestion_failed)
+        self.ai_worker = worker
+        self.ai_thread = start_worker(worker)
+
+    def ai_suggestion_ready(self, word, path, complete):
+        if self.ai_worker is None or self.game_over:
+            return  # Cancelled, the game has moved on
+        self.ai_worker = None
         self.handle_ai_suggestion(word, path)
 
+    def ai_suggestion_failed(self, message):
+        if self.ai_worker is None or self.game_over:
+            return
+        self.ai_worker = None
+        print(f"AI helper failed: {message}")
+        self.ai_helper_btn.setText('AI Helper')
+        self.ai_helper_btn.setEnabled(True)
+
+    def cancel_ai_search(self):
+        if self.ai_worker is not None:
+            self.ai_worker.cancel()
+            self.ai_worker = None
+
     def handle_ai_suggestion(self, word, path):
         if word is None:
             QMessageBox.information(self, "No Suggestions", "No valid suggestions found on the board.")
@@ -406,7 +484,7 @@ class BoggleGame(QWidget):
             self.ai_cooldown_remaining -= 1
         else:
             self.ai_cooldown_label.setText("")
-            self.ai_helper_btn.setEnabled(True)
+            self.ai_helper_btn.setEnabled(self.board_ready)
             if self.ai_cooldown_timer:
                 self.ai_cooldown_timer.stop()
                 self.ai_cooldown_timer = None
@@ -576,10 +654,21 @@ class BoggleGame(QWidget):
         self.time_left -= 1
 
     def end_game(self):
+        self.game_over = True
+        self.cancel_ai_search()
         if hasattr(self, 'timer'):
             self.timer.stop()
         if self.ai_cooldown_timer:
             self.ai_cooldown_timer.stop()
+        if not self.board_ready:
+            # Ended while the board was still being generated, there is no game to analyse or save
+            # (show_board() drops the board when it arrives)
+            if self.main_window:
+                self.hide()
+                self.main_window.show()
+            else:
+                self.close()
+            return
         game_data = {
             'score': self.score,
             'found_words': self.found_words,
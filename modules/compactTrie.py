@@ -0,0 +1,162 @@
+from array import array
+
+'''
+This file stores the dictionary as a compact, array-backed prefix tree.
+The original Trie in validation.py keeps a Python dict and a TrieNode object for
+every node, which is hundreds of thousands of objects for enable1.txt. Here
+every node is just an integer ID and its data lives in a few flat arrays.
+
+Layout:
+ - Nodes are numbered in breadth-first order, root is node 0
+ - The children of a node always sit next to each other, sorted by letter
+ - self.labels - bytes, labels[n] is the letter on the edge leading into node n
+ - self.first_child - array, ID of the first child of node n
+ - self.child_count - bytes, number of children of node n
+ - self.depths - bytes, number of letters on the path to node n (the word length)
+ - self.word_ids - array, word ID of node n or -1 if node n does not end a word
+ - self.parents - array, ID of the parent of node n (used to rebuild words)
+ - Word IDs are the position of the word in the sorted word list
+
+Because the children of a node are contiguous in self.labels, finding a child
+is a single bytes.find() over at most 26 letters, which runs in C.
+
+Key Methods:
+ - __init__(self, words):
+        - Builds the arrays from any iterable of words
+        - Words are upper-cased and de-duplicated
+        - Builds level by level from the sorted words, so no TrieNode objects are created
+ - from_arrays(cls, arrays, word_count, buffer=None):
+        - Wraps arrays built earlier, used by lexiconCache to load a memory-mapped file
+        - 'arrays' maps every name in CompactTrie.ARRAYS to its data
+ - child(self, node, code):
+        - Returns the child of node along letter code (an ASCII int), or -1
+ - walk(self, node, text):
+        - Follows every letter of text from node, returns the final node or -1
+        - Used for multi-letter tiles such as 'Qu'
+ - search(self, word) / starts_with(self, prefix):
+        - Same interface as validation.Trie so WordValidator can use either
+ - is_word(self, node) / word_id(self, node):
+        - Information about a node reached with child() or walk()
+ - word_at(self, node):
+        - Rebuilds the word spelled by the path to node
+ - memory_bytes(self):
+        - Size of the arrays in bytes
+'''
+
+
+class CompactTrie:
+    ROOT = 0
+    # Name and item type of every per-node array, in the order lexiconCache stores them
+    ARRAYS = (
+        ('labels', 'B'),
+        ('child_count', 'B'),
+        ('depths', 'B'),
+        ('parents', 'i'),
+        ('word_ids', 'i'),
+        ('first_child', 'i'),
+    )
+
+    def __init__(self, words=()):
+        words = sorted(set(word.strip().upper() for word in words if word.strip()))
+        labels = bytearray([0])
+        parents = array('i', [-1])
+        word_ids = array('i', [-1])
+        first_child = array('i', [0])
+        child_count = bytearray([0])
+        depths = bytearray([0])
+
+        # Each level holds (word ID, word, node of its prefix) for words long enough to reach it
+        level = [(word_id, word, self.ROOT) for word_id, word in enumerate(words)]
+        depth = 0
+        while level:
+            next_level = []
+            last_prefix = None
+            last_node = -1
+            for word_id, word, parent in level:
+                prefix = word[:depth + 1]
+                if prefix != last_prefix:
+                    last_node = len(labels)
+                    last_prefix = prefix
+                    if child_count[parent] == 0:
+                        first_child[parent] = last_node
+                    child_count[parent] += 1
+                    labels.append(ord(prefix[-1]))
+                    parents.append(parent)
+                    word_ids.append(-1)
+                    first_child.append(0)
+                    child_count.append(0)
+                    depths.append(depth + 1)
+                if len(word) == depth + 1:
+                    word_ids[last_node] = word_id
+                else:
+                    next_level.append((word_id, word, last_node))
+            level = next_level
+            depth += 1
+
+        self.labels = bytes(labels)
+        self.child_count = bytes(child_count)
+        self.depths = bytes(depths)
+        self.parents = parents
+        self.word_ids = word_ids
+        self.first_child = first_child
+        self.word_count = len(words)
+        self.buffer = None
+        self.frozen = True
+
+    @classmethod
+    def from_arrays(cls, arrays, word_count, buffer=None):
+        """Wrap arrays that were built earlier, e.g. memoryviews over a mapped cache file"""
+        trie = cls.__new__(cls)
+        for name, _ in cls.ARRAYS:
+            setattr(trie, name, arrays[name])
+        trie.word_count = word_count
+        trie.buffer = buffer
+        trie.frozen = True
+        return trie
+
+    @property
+    def node_count(self):
+        return len(self.labels)
+
+    def child(self, node, code):
+        start = self.first_child[node]
+        return self.labels.find(code, start, start + self.child_count[node])
+
+    def walk(self, node, text):
+        labels = self.labels
+        first_child = self.first_child
+        child_count = self.child_count
+        for code in text.upper().encode('ascii', 'replace'):
+            start = first_child[node]
+            node = labels.find(code, start, start + child_count[node])
+            if node < 0:
+                return -1
+        return node
+
+    def search(self, word):
+        node = self.walk(self.ROOT, word)
+        return node >= 0 and self.word_ids[node] >= 0
+
+    def starts_with(self, prefix):
+        return self.walk(self.ROOT, prefix) >= 0
+
+    def is_word(self, node):
+        return self.word_ids[node] >= 0
+
+    def word_id(self, node):
+        return self.word_ids[node]
+
+    def word_at(self, node):
+        letters = bytearray()
+        while node > self.ROOT:
+            letters.append(self.labels[node])
+            node = self.parents[node]
+        letters.reverse()
+        return letters.decode('ascii')
+
+    def freeze(self):
+        """The arrays are never changed after building, so there is nothing to do"""
+        self.frozen = True
+
+    def memory_bytes(self):
+        return sum(memoryview(getattr(self, name)).nbytes for name, _ in self.ARRAYS)
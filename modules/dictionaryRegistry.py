@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import threading
+from modules.validation import WordValidator
+
+'''
+This file shares one loaded dictionary between every part of the game.
+Building the Trie for enable1.txt is the slowest part of starting a game, and
+BoggleGame, WordFinder, BoardGenerator and AIHelper all need the same words.
+The registry loads each dictionary once per process and hands out the same
+frozen WordValidator to every caller.
+
+DictionaryStats Class:
+Key Attributes:
+ - self.path - Absolute path of the dictionary file
+ - self.min_length - Shortest word length kept from the file
+ - self.load_time - Seconds spent building the dictionary
+ - self.memory_bytes - Growth in peak resident memory while loading (None if unknown)
+ - self.requests - Number of times the dictionary has been handed out
+
+DictionaryRegistry Class:
+Key Attributes:
+ - self._entries - Dictionary mapping (path, min_length) to (WordValidator, DictionaryStats)
+ - self._lock - Lock so two threads never build the same dictionary twice
+
+Key Methods:
+ - get(self, dictionary_path, min_length):
+        - Returns the shared WordValidator for this path and filter
+        - Loads and freezes it the first time it is asked for
+ - stats(self):
+        - Returns a list of DictionaryStats for every loaded dictionary
+ - clear(self):
+        - Forgets every loaded dictionary (used when the word list changes)
+
+Module Functions:
+ - get_validator(dictionary_path, min_length):
+        - Shortcut to the process-wide registry
+ - get_registry():
+        - Returns the process-wide registry
+'''
+
+DEFAULT_DICTIONARY = 'data/enable1.txt'
+DEFAULT_MIN_LENGTH = 3
+
+
+def _peak_memory():
+    """Peak resident memory of this process in bytes, or None if unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class DictionaryStats:
+    def __init__(self, path, min_length, load_time, memory_bytes):
+        self.path = path
+        self.min_length = min_length
+        self.load_time = load_time
+        self.memory_bytes = memory_bytes
+        self.requests = 0
+
+    def __repr__(self):
+        if self.memory_bytes is None:
+            memory = "unknown"
+        else:
+            memory = f"{self.memory_bytes / (1024 * 1024):.1f} MB"
+        return (f"DictionaryStats({os.path.basename(self.path)}, min_length={self.min_length}, "
+                f"load_time={self.load_time:.3f}s, memory={memory}, requests={self.requests})")
+
+
+class DictionaryRegistry:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, dictionary_path=DEFAULT_DICTIONARY, min_length=DEFAULT_MIN_LENGTH):
+        key = (os.path.abspath(dictionary_path), min_length)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                memory_before = _peak_memory()
+                start = time.perf_counter()
+                validator = WordValidator(dictionary_path, min_length=min_length)
+                validator.freeze()
+                load_time = time.perf_counter() - start
+                memory_after = _peak_memory()
+                memory = None
+                if memory_before is not None and memory_after is not None:
+                    memory = memory_after - memory_before
+                entry = (validator, DictionaryStats(key[0], min_length, load_time, memory))
+                self._entries[key] = entry
+                print(f"Dictionary ready: {entry[1]}")
+            entry[1].requests += 1
+            return entry[0]
+
+    def stats(self):
+        with self._lock:
+            return [stats for _, stats in self._entries.values()]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_registry = DictionaryRegistry()
+
+
+def get_registry():
+    return _registry
+
+
+def get_validator(dictionary_path=DEFAULT_DICTIONARY, min_length=DEFAULT_MIN_LENGTH):
+    return _registry.get(dictionary_path, min_length)
@@ -0,0 +1,166 @@
+import math
+import random
+
+'''
+This file decides how BoardGenerator checks a candidate board against the difficulty.
+A full solve is only needed to know the exact word count, but the difficulty only
+needs to know which side of a threshold the count falls on.
+
+Strategies (chosen with BoardGenerator(strategy=...)):
+ - 'full' - FullSolveStrategy, solves every candidate completely (the original behaviour)
+ - 'early_exit' - EarlyExitStrategy (default), stops solving as soon as the answer is known
+        - Easy 4x4 needs 80+ words, so the search stops at the 80th word and accepts
+        - Hard 4x4 needs fewer than 50, so the search stops at the 50th word and rejects
+        - Medium stops at its upper limit and rejects
+ - 'prefilter' - PrefilterStrategy, early exit plus a statistical check that throws away
+        hopeless boards before any search runs
+
+Key Methods of every strategy:
+ - should_solve(self, generator, board) - False to reject the board without solving it
+ - word_limit(self, generator) - Number of words after which the solver can stop (None for no limit)
+
+BoardFeatureModel Class:
+ - Estimates log(1 + word count) from a few letter features with a linear model
+ - Features: vowel ratio, squared distance from the best vowel ratio, ratio of awkward
+   letters (J, K, Qu, X, Z, V, W, F, B), ratio of S tiles, mean log letter weight and
+   ratio of different letters
+ - self.coefficients - One weight per feature (the first is the constant term)
+ - self.residual - Standard deviation of the model's error on the boards it was fitted on
+ - predict(self, board) - Estimated log(1 + word count)
+ - fit(self, boards, word_counts) - Least-squares fit, sets coefficients and residual
+ - calibrate(cls, size, samples) - Rolls and solves 'samples' dice boards and fits a new model
+
+The built-in coefficients were fitted on 3000 dice boards of each size.
+The model is weak on its own (it explains around 30-40% of the variance), so
+PrefilterStrategy only rejects a board when the estimate is more than 'margin'
+residuals outside the difficulty band. With the default margin of 2 it rejects
+few in-band Easy or Medium boards, and most of the boards that cannot be Hard.
+'''
+
+# English letter weights, the same table BoardGenerator.generate_random uses
+LETTER_WEIGHTS = {
+    'E': 12, 'T': 9, 'A': 8, 'O': 8, 'I': 7, 'N': 7,
+    'S': 6, 'H': 6, 'R': 6, 'L': 4, 'D': 4, 'C': 3,
+    'U': 3, 'M': 3, 'W': 2, 'F': 2, 'G': 2, 'Y': 2,
+    'P': 2, 'B': 1, 'V': 1, 'K': 1, 'J': 1, 'X': 1,
+    'Qu': 1, 'Z': 1
+}
+AWKWARD_LETTERS = ('J', 'K', 'Qu', 'X', 'Z', 'V', 'W', 'F', 'B')
+BEST_VOWEL_RATIO = 0.38
+
+DEFAULT_MODELS = {
+    4: ([0.091, 0.148, -9.156, -0.576, 2.343, 1.756, 2.223], 0.418),
+    5: ([2.214, -0.129, -8.213, -1.070, 2.542, 1.439, 1.496], 0.324),
+}
+
+
+class BoardFeatureModel:
+    def __init__(self, coefficients, residual):
+        self.coefficients = coefficients
+        self.residual = residual
+
+    @classmethod
+    def for_size(cls, size):
+        coefficients, residual = DEFAULT_MODELS.get(size, DEFAULT_MODELS[5])
+        return cls(list(coefficients), residual)
+
+    @staticmethod
+    def features(board):
+        tiles = [letter for board_row in board for letter in board_row]
+        count = len(tiles)
+        vowel_ratio = sum(letter in 'AEIOU' for letter in tiles) / count
+        return [
+            1.0,
+            vowel_ratio,
+            (vowel_ratio - BEST_VOWEL_RATIO) ** 2,
+            sum(letter in AWKWARD_LETTERS for letter in tiles) / count,
+            tiles.count('S') / count,
+            sum(math.log(LETTER_WEIGHTS.get(letter, 1)) for letter in tiles) / count,
+            len(set(tiles)) / count,
+        ]
+
+    def predict(self, board):
+        return sum(weight * value for weight, value in zip(self.coefficients, self.features(board)))
+
+    def fit(self, boards, word_counts):
+        rows = [self.features(board) for board in boards]
+        targets = [math.log1p(count) for count in word_counts]
+        size = len(rows[0])
+        # Normal equations (X^T X) w = X^T y, solved by Gauss-Jordan elimination
+        matrix = [[sum(row[i] * row[j] for row in rows) for j in range(size)] +
+                  [sum(row[i] * target for row, target in zip(rows, targets))] for i in range(size)]
+        for i in range(size):
+            pivot = max(range(i, size), key=lambda r: abs(matrix[r][i]))
+            matrix[i], matrix[pivot] = matrix[pivot], matrix[i]
+            for r in range(size):
+                if r != i and matrix[i][i]:
+                    factor = matrix[r][i] / matrix[i][i]
+                    matrix[r] = [a - factor * b for a, b in zip(matrix[r], matrix[i])]
+        self.coefficients = [matrix[i][size] / matrix[i][i] if matrix[i][i] else 0.0 for i in range(size)]
+        errors = [self.predict(board) - target for board, target in zip(boards, targets)]
+        self.residual = math.sqrt(sum(error * error for error in errors) / len(errors))
+        return self
+
+    @classmethod
+    def calibrate(cls, size, samples=3000, seed=None):
+        from modules.boardGen import BoardGenerator
+        generator = BoardGenerator(size)
+        state = random.getstate()
+        random.seed(seed)
+        boards = [generator.generate_candidate() for _ in range(samples)]
+        random.setstate(state)
+        counts = [summary.word_count for summary in generator.word_finder.solve_many(boards)]
+        return cls.for_size(size).fit(boards, counts)
+
+
+class FullSolveStrategy:
+    def should_solve(self, generator, board):
+        return True
+
+    def word_limit(self, generator):
+        return None
+
+
+class EarlyExitStrategy(FullSolveStrategy):
+    def word_limit(self, generator):
+        lowest, highest = generator.difficulty_band()
+        # Reaching 'highest' words rejects the board, reaching 'lowest' with no upper limit accepts it
+        if highest is not None:
+            return highest
+        return lowest if lowest > 0 else None
+
+
+class PrefilterStrategy(EarlyExitStrategy):
+    def __init__(self, margin=2.0, models=None):
+        self.margin = margin
+        self.models = models or {}
+
+    def model(self, size):
+        if size not in self.models:
+            self.models[size] = BoardFeatureModel.for_size(size)
+        return self.models[size]
+
+    def should_solve(self, generator, board):
+        model = self.model(generator.size)
+        estimate = model.predict(board)
+        allowance = self.margin * model.residual
+        lowest, highest = generator.difficulty_band()
+        if lowest > 0 and math.log1p(lowest) - estimate > allowance:
+            return False
+        if highest is not None and estimate - math.log1p(highest) > allowance:
+            return False
+        return True
+
+
+STRATEGIES = {
+    'full': FullSolveStrategy,
+    'early_exit': EarlyExitStrategy,
+    'prefilter': PrefilterStrategy,
+}
+
+
+def get_strategy(strategy):
+    """Accepts a strategy name from STRATEGIES or an object with should_solve/word_limit"""
+    if isinstance(strategy, str):
+        return STRATEGIES[strategy]()
+    return strategy
@@ -0,0 +1,212 @@
+import math
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+from modules.dictionaryRegistry import get_validator
+
+'''
+This file precomputes how common every dictionary word and prefix is, so the AI
+helper never calls into wordfreq while it searches.
+
+Scores use the AI helper's Zipf scale: log10(frequency * 1e8), so about 0 for the
+rarest words wordfreq knows and 7-8 for 'the' or 'and'. UNKNOWN (-1.0) marks
+words and prefixes wordfreq has no frequency for.
+
+Arrays (float32, aligned with the CompactTrie they were built for):
+ - self.word_zipf - Score of every word, indexed by dictionary word ID
+ - self.node_zipf - Score of the letters spelled by every trie node, used as a word
+        (the AI ranks prefixes in its beam with this)
+ - self.best_below - Highest word score at or below every trie node
+        (if it is below a threshold, no word through that prefix can reach it, so
+         searches can drop the prefix without losing anything)
+
+Building needs wordfreq (about 1.5 seconds). The arrays are then saved to
+data/enable1.min3.freq and memory-mapped on later starts, so wordfreq is not
+imported at all. The file is rebuilt when the trie it belongs to changes.
+Without wordfreq and without a saved file, scores are estimated from the rank of
+each word in data/popular_words.txt (Zipf's law), and nothing is saved.
+
+Key Methods:
+ - zipf(self, node) / word_score(self, word_id) / best(self, node)
+        - Score lookups, zipf() is for any node and returns UNKNOWN for unknown letters
+ - build(cls, trie, frequencies):
+        - Builds the arrays from a dictionary mapping lower-case word -> frequency
+
+Key Functions:
+ - get_frequency_index(validator=None):
+        - The index for the shared dictionary (or the given WordValidator), loaded once per process
+ - load_or_build(trie, cache_path):
+        - Loads the saved file, or builds (and saves) the index
+'''
+
+MAGIC = b'BGFQ'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sIIII')
+ARRAYS = ('word_zipf', 'node_zipf', 'best_below')
+UNKNOWN = -1.0
+POPULAR_WORDS = 'data/popular_words.txt'
+
+
+def trie_fingerprint(trie):
+    """Checksum of the trie shape, so a saved index is never used with another word list"""
+    return zlib.crc32(bytes(trie.child_count), zlib.crc32(trie.labels)) ^ trie.word_count
+
+
+def zipf_score(frequency):
+    return max(0.0, math.log10(frequency * 1e8)) if frequency > 0 else UNKNOWN
+
+
+class FrequencyIndex:
+    def __init__(self, word_zipf, node_zipf, best_below, buffer=None):
+        self.word_zipf = word_zipf
+        self.node_zipf = node_zipf
+        self.best_below = best_below
+        self.buffer = buffer
+
+    @classmethod
+    def build(cls, trie, frequencies):
+        node_count = trie.node_count
+        word_zipf = array('f', [UNKNOWN]) * trie.word_count
+        node_zipf = array('f', [UNKNOWN]) * node_count
+        best_below = array('f', [UNKNOWN]) * node_count
+        labels = trie.labels
+        parents = trie.parents
+        word_ids = trie.word_ids
+        # Nodes are in breadth-first order, so a parent's text is always ready before its children's
+        texts = [''] * node_count
+        for node in range(1, node_count):
+            text = texts[parents[node]] + chr(labels[node]).lower()
+            texts[node] = text
+            score = zipf_score(frequencies.get(text, 0.0))
+            node_zipf[node] = score
+            if word_ids[node] >= 0:
+                word_zipf[word_ids[node]] = score
+                best_below[node] = score
+        # Children always have higher IDs than their parent, so one backwards pass fills best_below
+        for node in range(node_count - 1, 0, -1):
+            parent = parents[node]
+            if best_below[node] > best_below[parent]:
+                best_below[parent] = best_below[node]
+        return cls(word_zipf, node_zipf, best_below)
+
+    def zipf(self, node):
+        return self.node_zipf[node] if node >= 0 else UNKNOWN
+
+    def word_score(self, word_id):
+        return self.word_zipf[word_id]
+
+    def best(self, node):
+        return self.best_below[node]
+
+
+def _padding(offset):
+    return (-offset) % 8
+
+
+def save_index(index, trie, cache_path):
+    temp_path = f"{cache_path}.tmp{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, trie.node_count, trie.word_count, trie_fingerprint(trie))
+        f.write(header)
+        offset = len(header)
+        for name in ARRAYS:
+            section = bytes(getattr(index, name))
+            pad = _padding(offset)
+            f.write(b'\0' * pad)
+            f.write(section)
+            offset += pad + len(section)
+    os.replace(temp_path, cache_path)
+
+
+def load_index(trie, cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) < HEADER.size:
+        buffer.close()
+        return None
+    magic, version, node_count, word_count, fingerprint = HEADER.unpack_from(buffer, 0)
+    if (magic != MAGIC or version != FORMAT_VERSION or node_count != trie.node_count
+            or word_count != trie.word_count or fingerprint != trie_fingerprint(trie)):
+        buffer.close()
+        return None
+
+    view = memoryview(buffer)
+    offset = HEADER.size
+    arrays = []
+    for length in (word_count, node_count, node_count):
+        offset += _padding(offset)
+        end = offset + length * 4
+        if end > len(buffer):
+            view.release()
+            buffer.close()
+            return None
+        arrays.append(view[offset:end].cast('f'))
+        offset = end
+    return FrequencyIndex(*arrays, buffer=buffer)
+
+
+def _rank_frequencies(path=POPULAR_WORDS):
+    """Frequency estimates from a most-common-first word list, used when wordfreq is missing"""
+    frequencies = {}
+    try:
+        with open(path, 'r') as f:
+            for rank, line in enumerate(f, start=1):
+                word = line.strip().lower()
+                if word and word not in frequencies:
+                    # Zipf's law: frequency falls with 1/rank, 'the' is about 5% of English text
+                    frequencies[word] = 0.05 / rank
+    except OSError as e:
+        print(f"Could not read {path}: {e}")
+    return frequencies
+
+
+def load_or_build(trie, cache_path):
+    index = load_index(trie, cache_path)
+    if index is not None:
+        return index
+    try:
+        from wordfreq import get_frequency_dict
+    except ImportError:
+        print("wordfreq is not installed, estimating word frequencies from popular_words.txt")
+        return FrequencyIndex.build(trie, _rank_frequencies())
+
+    print(f"Building word frequency index {cache_path}")
+    index = FrequencyIndex.build(trie, get_frequency_dict('en', wordlist='best'))
+    try:
+        save_index(index, trie, cache_path)
+    except OSError as e:
+        print(f"Could not write word frequency index: {e}")
+    return index
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def cache_path_for(dictionary_path, min_length):
+    base, _ = os.path.splitext(dictionary_path)
+    return f"{base}.min{min_length}.freq"
+
+
+def get_frequency_index(validator=None):
+    if validator is None:
+        validator = get_validator()
+    with _indexes_lock:
+        index = _indexes.get(id(validator.trie))
+        if index is None:
+            path = cache_path_for(validator.dictionary_path, validator.min_length)
+            index = load_or_build(validator.trie, path)
+            _indexes[id(validator.trie)] = index
+        return index
+
+
+if __name__ == '__main__':
+    # Build step: python -m modules.frequencyIndex
+    built = get_frequency_index()
+    print(f"{len(built.word_zipf)} word scores, {len(built.node_zipf)} node scores")
@@ -3,6 +3,7 @@ from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
                              QPushButton, QScrollArea, QFrame)
 from PyQt5.QtCore import Qt
+from modules.postGameAnalysis import completion, get_post_game_analyser
 
 """
 GameDetailWindow displays detailed breakdown of a single game.
@@ -13,16 +14,20 @@ Key Features:
 - Color-coded: Green for found words, Red for missed words
 - Green words displayed first, then red words
 - Completion percentage shown for each word length category
+- Points left on the board and the longest missed word
+- Words are grouped by postGameAnalysis.py, the same analysis AnalyticsWindow shows,
+  and it is kept per game ID so opening a game again does not repeat it
 - Back button returns to GameHistoryWindow
 """
 
 
 class GameDetailWindow(QWidget):
 
-    def __init__(self, game_data, history_window=None):
+    def __init__(self, game_data, history_window=None, game_id=None):
         super().__init__()
         self.game_data = game_data
         self.history_window = history_window
+        self.analysis = get_post_game_analyser().analyse(game_data, game_id)
         self.initUI()
 
     def initUI(self):
@@ -36,11 +41,9 @@ class GameDetailWindow(QWidget):
         header_layout = QVBoxLayout()
         header_layout.setSpacing(10)
 
-        found = len(self.game_data.get('found_words', []))
-        total = len(self.game_data.get('all_possible_words', []))
-        completion = (found / total * 100) if total > 0 else 0
+        percentage = self.analysis.completion
 
-        completion_label = QLabel(f'Completion: <span style="color: #FF9800;">{completion:.1f}%</span>')
+        completion_label = QLabel(f'Completion: <span style="color: #FF9800;">{percentage:.1f}%</span>')
         completion_label.setStyleSheet("""
             font-size: 42px;
             font-weight: bold;
@@ -61,6 +64,13 @@ class GameDetailWindow(QWidget):
             color: #666;
         """)
 
+        longest = self.analysis.longest_missed.lower() if self.analysis.longest_missed else 'none'
+        missed_label = QLabel(f"Points left on the board: {self.analysis.points_left} • Longest missed word: {longest}")
+        missed_label.setStyleSheet("""
+            font-size: 16px;
+            color: #f44336;
+        """)
+
         top_bar = QHBoxLayout()
         back_btn = QPushButton('Back')
         back_btn.setFixedSize(120, 40)
@@ -85,6 +95,7 @@ class GameDetailWindow(QWidget):
         header_layout.addLayout(top_bar)
         header_layout.addWidget(completion_label)
         header_layout.addWidget(info_label)
+        header_layout.addWidget(missed_label)
 
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)
@@ -150,23 +161,7 @@ class GameDetailWindow(QWidget):
             return "Unknown date"
 
     def group_words_by_length(self):
-        found_words = set(word.upper() for word in self.game_data.get('found_words', []))
-        all_words = set(word.upper() for word in self.game_data.get('all_possible_words', []))
-        missed_words = all_words - found_words
-        word_groups = {}
-        for word in all_words:
-            length = len(word)
-            if length not in word_groups:
-                word_groups[length] = {'found': [], 'missed': []}
-
-            if word in found_words:
-                word_groups[length]['found'].append(word)
-            else:
-                word_groups[length]['missed'].append(word)
-        for length in word_groups:
-            word_groups[length]['found'].sort()
-            word_groups[length]['missed'].sort()
-        return word_groups
+        return self.analysis.by_length
 
     def create_word_group_widget(self, length, words_dict):
         container = QWidget()
@@ -175,11 +170,10 @@ class GameDetailWindow(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
 
         found_count = len(words_dict['found'])
-        total_count = found_count + len(words_dict['missed'])
-        completion = (found_count / total_count * 100) if total_count > 0 else 0
+        percentage = completion(found_count, found_count + len(words_dict['missed']))
 
         length_str = f"{length}" if isinstance(length, int) else length
-        header = QLabel(f'{length_str} Letter Words <span style="color: #4CAF50;">{completion:.1f}%</span>')
+        header = QLabel(f'{length_str} Letter Words <span style="color: #4CAF50;">{percentage:.1f}%</span>')
         header.setStyleSheet("""
             font-size: 22px;
             font-weight: bold;
@@ -1,169 +1,209 @@
 import sys
-import json
-import os
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QScrollArea, QFrame, QMessageBox)
-from PyQt5.QtCore import Qt, QtWarningMsg
+                             QPushButton, QListView, QStyledItemDelegate, QStyle, QMessageBox)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QEvent, QRect, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+from modules.historyStore import get_history_store
+from modules.postGameAnalysis import get_post_game_analyser
 
 """
 GameHistoryWindow displays a scrollable list of all previously played games.
 Each game is shown as a clickable block with summary information.
 
 Key Features:
-- Loads game data from data/game_history.json
+- Loads game data from the history store (data/game_history.jsonl, see historyStore.py)
 - Displays games in reverse chronological order (most recent first)
 - Each game block shows: completion %, timestamp, game settings
 - Click any block to view detailed breakdown
 - Delete button on each block to remove individual games
 - Back button returns to main menu
+- Sort and filter buttons cycle through their options, both only read the
+  history store's summary index, never a game's word lists
+
+The list is a QListView over GameListModel, so it stays fast with a long history:
+- The model starts with only the game IDs (from HistoryStore.query) and fetches
+  summaries PAGE_SIZE games at a time as the list is scrolled (canFetchMore/fetchMore)
+- GameBlockDelegate paints the blocks, the view only paints the rows on screen
+  and no widgets are created per game
+- The full game (with its word lists) is read only when a block is opened
+- Deleting a game removes its one row, the rest of the list is left as it is
 """
 
+PAGE_SIZE = 50
+BLOCK_HEIGHT = 100
+BLOCK_SPACING = 15
+# (button text, summary field to sort by, largest first)
+SORT_OPTIONS = [("Newest", None, True), ("Oldest", None, False),
+                ("Top Score", 'score', True), ("Completion", 'completion', True)]
+# (button text, summary filters)
+FILTER_OPTIONS = [("All Games", {}), ("Easy", {'difficulty': 'Easy'}), ("Medium", {'difficulty': 'Medium'}),
+                  ("Hard", {'difficulty': 'Hard'}), ("4x4", {'grid_size': 4}), ("5x5", {'grid_size': 5})]
+
+
+def format_timestamp(timestamp_str):
+    try:
+        dt = datetime.fromisoformat(timestamp_str)
+        day_name = dt.strftime('%A')
+        day = dt.day
+        month_name = dt.strftime('%B')
+        time = dt.strftime('%H:%M')
+
+        # Add ordinal suffix (st, nd, rd, th)
+        if 10 <= day % 100 <= 20:
+            suffix = 'th'
+        else:
+            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
 
-class GameBlock(QFrame):
-    def __init__(self, game_data, index, parent_window):
-        super().__init__()
-        self.game_data = game_data
-        self.index = index
-        self.parent_window = parent_window
-        self.setFrameStyle(QFrame.Box | QFrame.Raised)
-        self.setLineWidth(2)
-        self.setCursor(Qt.PointingHandCursor)
-        self.initUI()
-
-    def initUI(self):
-        self.setFixedHeight(100)
-        self.setStyleSheet("""
-            GameBlock {
-                background-color: white;
-                border: 2px solid #ddd;
-                border-radius: 15px;
-                padding: 10px;
-            }
-            GameBlock:hover {
-                border: 2px solid #4CAF50;
-                background-color: #f9f9f9;
-            }
-        """)
-
-        main_layout = QHBoxLayout()
-        main_layout.setContentsMargins(15, 15, 15, 15)
-
-        found = len(self.game_data.get('found_words', []))
-        total = len(self.game_data.get('all_possible_words', []))
-        completion = (found / total * 100) if total > 0 else 0
-
-        completion_badge = QLabel(f"{completion:.1f}%")
-        completion_badge.setFixedSize(80, 60)
-        completion_badge.setAlignment(Qt.AlignCenter)
-        completion_badge.setStyleSheet("""
-            QLabel {
-                background-color: #2196F3;
-                color: white;
-                font-size: 18px;
-                font-weight: bold;
-                border-radius: 10px;
-            }
-        """)
-
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(5)
+        return f"{day_name} {day}{suffix} {month_name} {time}"
+    except:
+        return "Unknown date"
 
-        timestamp_str = self.game_data.get('timestamp', '')
-        formatted_time = self.format_timestamp(timestamp_str)
 
-        timestamp_label = QLabel(formatted_time)
-        timestamp_label.setStyleSheet("""
-            font-size: 14px;
-            color: #666;
-        """)
+class GameListModel(QAbstractListModel):
+    SummaryRole = Qt.UserRole + 1
 
-        grid_size = self.game_data.get('grid_size', 4)
-        difficulty = self.game_data.get('difficulty', 'Unknown')
-        timer = self.game_data.get('timer', 'Unknown')
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.game_ids = []
+        self.summaries = []
 
-        settings_text = f"{grid_size}x{grid_size} Grid, {difficulty} mode, {timer}"
-        settings_label = QLabel(settings_text)
-        settings_label.setStyleSheet("""
-            font-size: 16px;
-            font-weight: bold;
-            color: #333;
-        """)
+    def reload(self, sort_by=None, descending=True, filters=None):
+        self.beginResetModel()
+        self.game_ids = self.store.query(sort_by, descending, **(filters or {}))
+        self.summaries = []
+        self.endResetModel()
 
-        info_layout.addWidget(timestamp_label)
-        info_layout.addWidget(settings_label)
-        info_layout.addStretch()
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.summaries)
 
-        delete_btn = QPushButton('🗑️')
-        delete_btn.setFixedSize(40, 40)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                font-size: 20px;
-                border-radius: 20px;
-                border: 2px solid #d32f2f;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
-        delete_btn.clicked.connect(self.delete_game)
-
-        main_layout.addWidget(completion_badge)
-        main_layout.addLayout(info_layout)
-        main_layout.addStretch()
-        main_layout.addWidget(delete_btn)
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self.summaries) < len(self.game_ids)
 
-        self.setLayout(main_layout)
-
-    def format_timestamp(self, timestamp_str):
-        try:
-            dt = datetime.fromisoformat(timestamp_str)
-            day_name = dt.strftime('%A')
-            day = dt.day
-            month_name = dt.strftime('%B')
-            time = dt.strftime('%H:%M')
-
-            # Add ordinal suffix (st, nd, rd, th)
-            if 10 <= day % 100 <= 20:
-                suffix = 'th'
-            else:
-                suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
-
-            return f"{day_name} {day}{suffix} {month_name} {time}"
-        except:
-            return "Unknown date"
-
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.parent_window.open_game_detail(self.game_data, self.index)
-
-    def delete_game(self):
-        self.parent_window.delete_game_at_index(self.index)
+    def fetchMore(self, parent=QModelIndex()):
+        start = len(self.summaries)
+        page = self.game_ids[start:start + PAGE_SIZE]
+        if not page:
+            return
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self.summaries.extend(self.store.summary(game_id) or {} for game_id in page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.summaries):
+            return None
+        summary = self.summaries[index.row()]
+        if role == self.SummaryRole:
+            return summary
+        if role == Qt.DisplayRole:
+            return format_timestamp(summary.get('timestamp', ''))
+        return None
+
+    def game_id(self, row):
+        return self.game_ids[row]
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.game_ids[row]
+        del self.summaries[row]
+        self.endRemoveRows()
+
+    def total(self):
+        return len(self.game_ids)
+
+
+class GameBlockDelegate(QStyledItemDelegate):
+    """Paints one game block, and turns clicks into open and delete requests"""
+    open_requested = pyqtSignal(int)
+    delete_requested = pyqtSignal(int)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), BLOCK_HEIGHT + BLOCK_SPACING)
+
+    def block_rect(self, rect):
+        return QRect(rect.left() + 1, rect.top() + 1, rect.width() - 2, BLOCK_HEIGHT - 2)
+
+    def delete_rect(self, rect):
+        block = self.block_rect(rect)
+        return QRect(block.right() - 55, block.center().y() - 20, 40, 40)
+
+    def paint(self, painter, option, index):
+        summary = index.data(GameListModel.SummaryRole) or {}
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        block = self.block_rect(option.rect)
+        painter.setPen(QPen(QColor('#4CAF50' if hovered else '#ddd'), 2))
+        painter.setBrush(QColor('#f9f9f9' if hovered else 'white'))
+        painter.drawRoundedRect(block, 15, 15)
+
+        badge = QRect(block.left() + 15, block.center().y() - 30, 80, 60)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor('#2196F3'))
+        painter.drawRoundedRect(badge, 10, 10)
+        painter.setPen(QColor('white'))
+        painter.setFont(self.font(18, bold=True))
+        painter.drawText(badge, Qt.AlignCenter, f"{summary.get('completion', 0):.1f}%")
+
+        text_left = badge.right() + 15
+        painter.setPen(QColor('#666'))
+        painter.setFont(self.font(14))
+        painter.drawText(QRect(text_left, block.top() + 15, block.width() - 200, 22),
+                         Qt.AlignLeft | Qt.AlignVCenter, format_timestamp(summary.get('timestamp', '')))
+
+        grid_size = summary.get('grid_size', 4)
+        settings_text = (f"{grid_size}x{grid_size} Grid, {summary.get('difficulty', 'Unknown')} mode, "
+                         f"{summary.get('timer', 'Unknown')}")
+        painter.setPen(QColor('#333'))
+        painter.setFont(self.font(16, bold=True))
+        painter.drawText(QRect(text_left, block.top() + 42, block.width() - 200, 24),
+                         Qt.AlignLeft | Qt.AlignVCenter, settings_text)
+
+        delete = self.delete_rect(option.rect)
+        painter.setPen(QPen(QColor('#d32f2f'), 2))
+        painter.setBrush(QColor('#f44336'))
+        painter.drawEllipse(delete)
+        painter.setPen(QColor('white'))
+        painter.setFont(self.font(20))
+        painter.drawText(delete, Qt.AlignCenter, '🗑️')
+        painter.restore()
+
+    def font(self, pixel_size, bold=False):
+        font = QFont()
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if self.delete_rect(option.rect).contains(event.pos()):
+                self.delete_requested.emit(index.row())
+                return True
+            if self.block_rect(option.rect).contains(event.pos()):
+                self.open_requested.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
 
 
 class GameHistoryWindow(QWidget):
     def __init__(self, main_menu=None):
         super().__init__()
         self.main_menu = main_menu
-        self.game_history = []
-        self.history_file = 'data/game_history.json'
+        self.store = get_history_store()
+        self.model = GameListModel(self.store, self)
+        self.sort_index = 0
+        self.filter_index = 0
         self.load_history()
         self.initUI()
 
     def load_history(self):
-        if not os.path.exists(self.history_file):
-            self.game_history = []
-            return
-
+        _, sort_by, descending = SORT_OPTIONS[self.sort_index]
         try:
-            with open(self.history_file, 'r') as f:
-                self.game_history = json.load(f)
-                self.game_history.reverse()
-        except Exception as e:
-            QMessageBox.warning(self, "Error loading history: {e}")
-            self.game_history = []
+            self.model.reload(sort_by, descending, FILTER_OPTIONS[self.filter_index][1])
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Error loading history: {e}")
 
     def initUI(self):
         self.setWindowTitle('Game History')
@@ -196,81 +236,107 @@ class GameHistoryWindow(QWidget):
             }
         """)
         back_btn.clicked.connect(self.back_to_menu)
+        self.sort_btn = self.create_toggle_button(SORT_OPTIONS[self.sort_index][0])
+        self.sort_btn.clicked.connect(self.toggle_sort)
+        self.filter_btn = self.create_toggle_button(FILTER_OPTIONS[self.filter_index][0])
+        self.filter_btn.clicked.connect(self.toggle_filter)
         header_layout.addWidget(title)
         header_layout.addStretch()
+        header_layout.addWidget(self.sort_btn)
+        header_layout.addWidget(self.filter_btn)
         header_layout.addWidget(back_btn)
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("""
-            QScrollArea {
+
+        self.games_view = QListView()
+        self.games_view.setStyleSheet("""
+            QListView {
                 border: none;
                 background-color: transparent;
             }
         """)
+        self.games_view.setUniformItemSizes(True)
+        self.games_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.games_view.setSelectionMode(QListView.NoSelection)
+        self.games_view.setFocusPolicy(Qt.NoFocus)
+        self.games_view.setMouseTracking(True)
+        self.delegate = GameBlockDelegate(self.games_view)
+        # Queued, so the row is removed after the view has finished handling the click
+        self.delegate.open_requested.connect(self.open_game_detail, Qt.QueuedConnection)
+        self.delegate.delete_requested.connect(self.delete_game_at_index, Qt.QueuedConnection)
+        self.games_view.setItemDelegate(self.delegate)
+        self.games_view.setModel(self.model)
+
+        self.empty_label = QLabel('No games played yet.\nStart playing to build your history!')
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.setStyleSheet("""
+            font-size: 24px;
+            color: #999;
+            padding: 100px;
+        """)
 
-        scroll_content = QWidget()
-        self.games_layout = QVBoxLayout()
-        self.games_layout.setSpacing(15)
-
-        if len(self.game_history) == 0:
-            empty_label = QLabel('No games played yet.\nStart playing to build your history!')
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet("""
-                font-size: 24px;
-                color: #999;
-                padding: 100px;
-            """)
-            self.games_layout.addWidget(empty_label)
-        else:
-            for i, game_data in enumerate(self.game_history):
-                game_block = GameBlock(game_data, i, self)
-                self.games_layout.addWidget(game_block)
-
-        self.games_layout.addStretch()
-        scroll_content.setLayout(self.games_layout)
-        scroll.setWidget(scroll_content)
         main_layout.addLayout(header_layout)
-        main_layout.addWidget(scroll)
+        main_layout.addWidget(self.games_view)
+        main_layout.addWidget(self.empty_label)
         self.setLayout(main_layout)
+        self.refresh_display()
+
+    def create_toggle_button(self, text):
+        button = QPushButton(text)
+        button.setFixedSize(120, 40)
+        button.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                font-size: 16px;
+                font-weight: bold;
+                border-radius: 10px;
+                border: 2px solid #1976D2;
+            }
+            QPushButton:hover {
+                background-color: #1976D2;
+            }
+        """)
+        return button
+
+    def toggle_sort(self):
+        self.sort_index = (self.sort_index + 1) % len(SORT_OPTIONS)
+        self.sort_btn.setText(SORT_OPTIONS[self.sort_index][0])
+        self.load_history()
+        self.refresh_display()
+
+    def toggle_filter(self):
+        self.filter_index = (self.filter_index + 1) % len(FILTER_OPTIONS)
+        self.filter_btn.setText(FILTER_OPTIONS[self.filter_index][0])
+        self.load_history()
+        self.refresh_display()
 
     def delete_game_at_index(self, index):
-        actual_index = len(self.game_history) - 1 - index
+        game_id = self.model.game_id(index)
         try:
-            with open(self.history_file, 'r') as f:
-                original_history = json.load(f)
-            del original_history[actual_index]
-            with open(self.history_file, 'w') as f:
-                json.dump(original_history, f, indent=2)
-            self.load_history()
+            self.store.delete(game_id)
+            get_post_game_analyser().forget(game_id)
+            self.model.remove_row(index)
             self.refresh_display()
-        except Exception as e:
+        except OSError as e:
             QMessageBox.warning(self, "Error", f"Failed to delete game: {e}")
 
     def refresh_display(self):
-        while self.games_layout.count():
-            child = self.games_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        if len(self.game_history) == 0:
-            empty_label = QLabel('No games played yet.\nStart playing to build your history!')
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet("""
-                font-size: 24px;
-                color: #999;
-                padding: 100px;
-            """)
-            self.games_layout.addWidget(empty_label)
+        empty = self.model.total() == 0
+        if self.filter_index == 0:
+            self.empty_label.setText('No games played yet.\nStart playing to build your history!')
         else:
-            for i, game_data in enumerate(self.game_history):
-                game_block = GameBlock(game_data, i, self)
-                self.games_layout.addWidget(game_block)
-        self.games_layout.addStretch()
+            self.empty_label.setText(f'No {FILTER_OPTIONS[self.filter_index][0]} games yet.')
+        self.empty_label.setVisible(empty)
+        self.games_view.setVisible(not empty)
 
-    def open_game_detail(self, game_data, index):
+    def open_game_detail(self, index):
         from modules.gameDetailWindow import GameDetailWindow
+        game_id = self.model.game_id(index)
+        game_data = self.store.get(game_id)
+        if game_data is None:
+            QMessageBox.warning(self, "Error", "This game could not be read from the history file.")
+            return
         self.hide()
-        self.detail_window = GameDetailWindow(game_data, self)
+        self.detail_window = GameDetailWindow(game_data, self, game_id)
         self.detail_window.show()
 
     def back_to_menu(self):
@@ -278,4 +344,4 @@ class GameHistoryWindow(QWidget):
             self.hide()
             self.main_menu.show()
         else:
-            self.close()
\ No newline at end of file
+            self.close()
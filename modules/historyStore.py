@@ -0,0 +1,486 @@
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from modules.postGameAnalysis import completion, completion_counts
+from modules.solutionStore import get_solution_store
+
+'''
+This file stores the saved game history as an append-only log (JSON Lines), so
+saving or deleting a game writes one line instead of rewriting every game.
+
+data/game_history.jsonl holds one record per line, oldest first:
+ - {"id": "...", "game": {...}} - A saved game (the same dictionary AnalyticsWindow saves)
+ - {"id": "...", "deleted": true} - A tombstone, the game with that ID was deleted
+Replaying the lines in order gives the current history. A line is written with a
+single O_APPEND write and flushed to disk, so two writers never mix their lines,
+and a line cut short by a crash is skipped when the log is read.
+
+Games are not kept in memory: replaying the log only reads the ID at the start
+of each line and remembers where the line is, and a game is parsed when it is
+asked for (get()).
+
+Summary index: data/game_history.index.jsonl keeps a small summary of every
+game (timestamp, grid size, difficulty, timer, score, found and possible word
+counts, completion) with the position of its line in the log. The process that
+appends a log line appends its index record straight after (other processes only
+replay the line), so listing, sorting and filtering the history (query()) reads
+only the index and never a word list:
+ - The first line holds the index format ('version'), names the log file it belongs
+   to (device and inode numbers), how far into it the index was last written in full
+   ('covers') and how many dead records that part holds ('dead', only live games are
+   rewritten), then one record per log line: {"id", "at", "len", "summary"} or
+   {"id", "at", "len", "deleted"}
+ - On start, the index is read and only log lines after the last indexed one (with
+   no unindexed line before it) are parsed, and the index is then written again
+ - A missing, damaged or out of date index is rebuilt from the whole log once
+
+Deleted games still take space until the log is compacted: once dead records
+(deleted games and their tombstones) reach COMPACT_MIN_DEAD and outnumber the live
+games, the live lines are copied to a temporary file that then replaces the log
+(os.replace, so the log is never half written).
+
+Word lists: with a SolutionStore (solutionStore.py, the shared store uses one),
+a game's all_possible_words is kept in the solution store and the log line holds
+only its key ('solution') and counts ('found_count', 'possible_count'). get() puts the list back,
+so callers always see the game as it was saved (a list whose dictionary has gone
+is left out rather than replaced, see solutionStore.py).
+
+Migration: the first time the store opens without a log, the games in the old
+data/game_history.json array are copied into a new log with fresh IDs. The old
+file is left as it was.
+
+Key Attributes:
+ - self.path - The log file
+ - self.index_path - The summary index file
+ - self.entries - OrderedDict mapping game ID -> (offset, length) of its line, oldest first
+ - self.summaries - Dictionary mapping game ID -> summary (see summarise())
+ - self.solutions - SolutionStore for word lists, or None to keep them in the log
+ - self.dead - Records in the log that no longer count (deleted games and tombstones)
+
+Key Methods:
+ - add(self, game):
+        - Appends a game, returns its new ID
+ - delete(self, game_id):
+        - Appends a tombstone, returns False if the ID is not in the history
+ - ids(self, newest_first=True):
+        - List of game IDs
+ - get(self, game_id):
+        - The full game dictionary read from the log, or None
+ - summary(self, game_id):
+        - The game's summary from the index, or None
+ - query(self, sort_by=None, descending=True, **filters):
+        - Game IDs whose summary matches every filter (e.g. difficulty='Hard', grid_size=5),
+          newest first or sorted by a summary field (e.g. 'score'), from the index only
+ - refresh(self):
+        - Reads records appended since the last read (e.g. by another window or process)
+ - compact(self):
+        - Rewrites the log with only the live games, and the index to match, then drops
+          the word lists no live game uses from the solution store
+
+Module Functions:
+ - summarise(game):
+        - Dictionary with timestamp, grid_size, difficulty, timer, score, found, possible and completion
+          (counted by postGameAnalysis.completion_counts, like the result screens)
+ - get_history_store():
+        - The process-wide store for data/game_history.jsonl, with the shared solution store
+'''
+
+HISTORY_PATH = 'data/game_history.jsonl'
+INDEX_SUFFIX = '.index.jsonl'
+LEGACY_HISTORY_PATH = 'data/game_history.json'
+COMPACT_MIN_DEAD = 32
+# Bumped when summaries are worked out differently, an index with another version is rebuilt
+INDEX_VERSION = 2
+OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+
+# Every record starts with its ID, so replaying the log can skip the game itself
+ID_PREFIX = b'{"id":"'
+TOMBSTONE_SUFFIX = b',"deleted":true}'
+GAME_PREFIX = b',"game":'
+
+
+def _encode(record):
+    return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _file_identity(stat):
+    """Device and inode numbers, they change when a file is replaced (e.g. by compaction)"""
+    return (stat.st_dev, stat.st_ino)
+
+
+def _read_header(line):
+    """Returns (game ID, deleted) for a log line, or None if the line is not a record"""
+    if line.startswith(ID_PREFIX):
+        end = line.find(b'"', len(ID_PREFIX))
+        if end > 0:
+            rest = line[end + 1:]
+            if rest == TOMBSTONE_SUFFIX:
+                return line[len(ID_PREFIX):end].decode('utf-8'), True
+            if rest.startswith(GAME_PREFIX):
+                return line[len(ID_PREFIX):end].decode('utf-8'), False
+    # Not written by add() or delete(), so fall back to parsing all of it
+    try:
+        record = json.loads(line)
+        return record['id'], bool(record.get('deleted'))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def summarise(game):
+    found, possible = completion_counts(game)
+    return {
+        'timestamp': game.get('timestamp', ''),
+        'grid_size': game.get('grid_size', 4),
+        'difficulty': game.get('difficulty', 'Unknown'),
+        'timer': game.get('timer', 'Unknown'),
+        'score': game.get('score', 0),
+        'found': found,
+        'possible': possible,
+        'completion': completion(found, possible),
+    }
+
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_PATH, legacy_path=LEGACY_HISTORY_PATH, solutions=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.solutions = solutions
+        self.index_path = os.path.splitext(path)[0] + INDEX_SUFFIX
+        self.entries = OrderedDict()
+        self.summaries = {}
+        self.dead = 0
+        self._offset = 0
+        self._identity = None
+        self._partial = False
+        self._index_stale = True
+        self._lock = threading.RLock()
+        if legacy_path is not None and not os.path.exists(path) and os.path.exists(legacy_path):
+            self.migrate()
+        with self._lock:
+            self.load_index()
+            self.refresh()
+            self._compact_if_needed()
+
+    def migrate(self):
+        try:
+            with open(self.legacy_path, 'r') as f:
+                games = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read old game history {self.legacy_path}: {e}")
+            return
+        self._write_log([_encode({'id': uuid.uuid4().hex, 'game': self._pack(game)}) for game in games])
+        print(f"Moved {len(games)} games from {self.legacy_path} to {self.path}")
+
+    def add(self, game):
+        game_id = uuid.uuid4().hex
+        self._append({'id': game_id, 'game': self._pack(game)})
+        return game_id
+
+    def delete(self, game_id):
+        with self._lock:
+            self.refresh()
+            if game_id not in self.entries:
+                return False
+            self._append({'id': game_id, 'deleted': True})
+            self._compact_if_needed()
+        return True
+
+    def ids(self, newest_first=True):
+        with self._lock:
+            self.refresh()
+            ids = list(self.entries)
+        if newest_first:
+            ids.reverse()
+        return ids
+
+    def query(self, sort_by=None, descending=True, **filters):
+        with self._lock:
+            self.refresh()
+            ids = list(self.entries)
+            summaries = self.summaries
+            if filters:
+                ids = [game_id for game_id in ids
+                       if all(summaries[game_id].get(field) == value for field, value in filters.items())]
+            # Newest first, and sort() keeps that order for games with equal values
+            ids.reverse()
+            if sort_by is not None:
+                ids.sort(key=lambda game_id: summaries[game_id].get(sort_by, 0), reverse=descending)
+            elif not descending:
+                ids.reverse()
+        return ids
+
+    def get(self, game_id):
+        with self._lock:
+            self.refresh()
+            location = self.entries.get(game_id)
+            if location is None:
+                return None
+            offset, length = location
+            try:
+                with open(self.path, 'rb') as f:
+                    f.seek(offset)
+                    game = json.loads(f.read(length))['game']
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Could not read game {game_id}: {e}")
+                return None
+        return self.solutions.unpack(game) if self.solutions is not None else game
+
+    def _pack(self, game):
+        return self.solutions.pack(game) if self.solutions is not None else game
+
+    def summary(self, game_id):
+        with self._lock:
+            return self.summaries.get(game_id)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, game_id):
+        return game_id in self.entries
+
+    def _append(self, record):
+        with self._lock:
+            self.refresh()
+            data = _encode(record)
+            if self._partial:
+                # Start a new line after a line a crash cut short, so this record stays readable
+                data = b'\n' + data
+            end = self._append_bytes(self.path, data)
+            # Only the writer indexes a line, readers just replay it
+            index_record = {'id': record['id'], 'at': end - len(data) + (1 if self._partial else 0),
+                            'len': len(data) - 1 - (1 if self._partial else 0)}
+            if record.get('deleted'):
+                index_record['deleted'] = True
+            else:
+                index_record['summary'] = summarise(record['game'])
+            try:
+                self._append_bytes(self.index_path, _encode(index_record))
+            except OSError as e:
+                print(f"Could not update game history index: {e}")
+            # Reading our own line back also picks up lines other writers added before it
+            self.refresh()
+
+    def _append_bytes(self, path, data):
+        """Appends data to path, returns where it ended"""
+        fd = os.open(path, OPEN_FLAGS, 0o644)
+        try:
+            # One write call per record, O_APPEND puts it after every earlier line
+            os.write(fd, data)
+            os.fsync(fd)
+            return os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+
+    def load_index(self):
+        """Reads the summary index, leaves the store empty if the index does not match the log"""
+        try:
+            stat = os.stat(self.path)
+            with open(self.index_path, 'rb') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            return
+        if tuple(header.get('log') or ()) != _file_identity(stat) or header.get('version') != INDEX_VERSION:
+            return
+
+        covers = header.get('covers', 0)
+        # Dead records before 'covers' were left out when the index was rewritten, the header counts them
+        self.dead = header.get('dead', 0)
+        records = []
+        seen = set()
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+                location = (record['at'], record['len'])
+                key = (record['id'], location[0])
+                summary = None if record.get('deleted') else record['summary']
+            except (ValueError, KeyError, TypeError):
+                # Damaged (e.g. cut short by a crash), the log line it stood for is read again below
+                continue
+            # Two processes can both index the same line (e.g. after a crash), count it once
+            if key not in seen:
+                seen.add(key)
+                records.append((location, record['id'], summary))
+        # Lines after 'covers' are indexed by whichever process wrote them, so they can come
+        # in any order, only the run of lines with no gap straight after 'covers' is used
+        records.sort(key=lambda item: item[0][0])
+        covered = covers
+        for location, game_id, summary in records:
+            offset, length = location
+            if offset >= covers:
+                if offset > covered:
+                    break
+                covered = offset + length + 1
+            if summary is None:
+                self.summaries.pop(game_id, None)
+                self.dead += 2 if self.entries.pop(game_id, None) is not None else 1
+            else:
+                previous = self.entries.get(game_id)
+                if previous is not None and previous != location:
+                    self.dead += 1
+                self.entries[game_id] = location
+                self.summaries[game_id] = summary
+
+        if covered > stat.st_size or not self._index_matches_log():
+            self.entries.clear()
+            self.summaries.clear()
+            self.dead = 0
+            return
+        self._offset = covered
+        self._identity = _file_identity(stat)
+        # Lines no process indexed (e.g. it crashed before it could) are read by refresh(),
+        # which then writes the index again from scratch
+        self._index_stale = covered < stat.st_size
+
+    def _index_matches_log(self):
+        """Spot check that the newest indexed game really is where the index says"""
+        if not self.entries:
+            return True
+        game_id = next(reversed(self.entries))
+        offset, length = self.entries[game_id]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length).startswith(ID_PREFIX + game_id.encode('utf-8') + b'"')
+
+    def refresh(self):
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return
+            size = stat.st_size
+            identity = _file_identity(stat)
+            if identity != self._identity or size < self._offset:
+                # A new file (e.g. another process compacted the log), read it again from the start
+                self.entries.clear()
+                self.summaries.clear()
+                self.dead = 0
+                self._offset = 0
+                self._identity = identity
+                self._index_stale = True
+            if size == self._offset:
+                if self._index_stale:
+                    self._write_index()
+                return
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+            # A last line without its newline is still being written (or was cut short), leave it
+            end = data.rfind(b'\n') + 1
+            self._partial = end < len(data)
+            position = 0
+            while position < end:
+                line_end = data.index(b'\n', position)
+                self._apply(data[position:line_end], self._offset + position)
+                position = line_end + 1
+            self._offset += end
+            if self._index_stale:
+                self._write_index()
+
+    def _apply(self, line, offset):
+        """Replays one log line (the process that wrote it has already indexed it)"""
+        header = _read_header(line)
+        if header is None:
+            if line.strip():
+                self.dead += 1
+            return
+        game_id, deleted = header
+        if deleted:
+            self.summaries.pop(game_id, None)
+            self.dead += 2 if self.entries.pop(game_id, None) is not None else 1
+            return
+        try:
+            summary = summarise(json.loads(line)['game'])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self.dead += 1
+            return
+        if game_id in self.entries:
+            self.dead += 1
+        self.entries[game_id] = (offset, len(line))
+        self.summaries[game_id] = summary
+
+    def _write_index(self):
+        """Writes the index for every live game from scratch"""
+        lines = [_encode({'version': INDEX_VERSION, 'log': list(self._identity), 'covers': self._offset,
+                          'dead': self.dead})]
+        for game_id, (offset, length) in self.entries.items():
+            lines.append(_encode({'id': game_id, 'at': offset, 'len': length,
+                                  'summary': self.summaries[game_id]}))
+        try:
+            os.replace(self._write_temp(self.index_path, lines), self.index_path)
+            self._index_stale = False
+        except OSError as e:
+            print(f"Could not write game history index: {e}")
+
+    def _compact_if_needed(self):
+        if self.dead >= COMPACT_MIN_DEAD and self.dead > len(self.entries):
+            self.compact()
+
+    def compact(self):
+        with self._lock:
+            for _ in range(3):
+                # Word lists stored from here on are kept, their games may not be in the log yet
+                snapshot = self.solutions.size() if self.solutions is not None else None
+                self.refresh()
+                offset = self._offset
+                with open(self.path, 'rb') as f:
+                    data = f.read(offset)
+                # Live lines are copied as they are, no game is parsed
+                lines = [data[start:start + length] + b'\n' for start, length in self.entries.values()]
+                temp_path = self._write_temp(self.path, lines)
+                # Lines another process appended while the copy was written would be lost, so try again
+                if os.path.getsize(self.path) == offset:
+                    os.replace(temp_path, self.path)
+                    stat = os.stat(self.path)
+                    position = 0
+                    for game_id, line in zip(list(self.entries), lines):
+                        self.entries[game_id] = (position, len(line) - 1)
+                        position += len(line)
+                    self.dead = 0
+                    self._offset = position
+                    self._identity = _file_identity(stat)
+                    self._write_index()
+                    if self.solutions is not None:
+                        self._retain_solutions(lines, snapshot)
+                    return
+                os.remove(temp_path)
+
+    def _retain_solutions(self, lines, snapshot):
+        """Drops the word lists only deleted games used from the solution store"""
+        keys = set()
+        for line in lines:
+            try:
+                key = json.loads(line)['game'].get('solution')
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+            if key is not None:
+                keys.add(key)
+        self.solutions.retain(keys, snapshot)
+
+    def _write_log(self, lines):
+        os.replace(self._write_temp(self.path, lines), self.path)
+
+    def _write_temp(self, path, lines):
+        temp_path = f"{path}.tmp{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        return temp_path
+
+
+_history_store = None
+_history_store_lock = threading.Lock()
+
+
+def get_history_store():
+    global _history_store
+    with _history_store_lock:
+        if _history_store is None:
+            _history_store = HistoryStore(solutions=get_solution_store())
+        return _history_store
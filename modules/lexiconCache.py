@@ -0,0 +1,153 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from modules.compactTrie import CompactTrie
+
+'''
+This file saves a built CompactTrie to a binary file next to the word list,
+so later starts can memory-map it instead of parsing enable1.txt again.
+
+File layout (all integers are native byte order, recorded in the header):
+ - Header: magic b'BGLX', format version, byte order flag, min_length,
+           node count, word count, SHA-256 of the source word list
+ - One section per array in CompactTrie.ARRAYS, in that order
+        - labels, child_count, depths - node_count bytes each
+        - parents, word_ids, first_child - node_count int32 values each
+ - Each section starts on an 8-byte boundary
+ - FORMAT_VERSION changes whenever CompactTrie.ARRAYS does
+
+Loading only reads the header. The int32 sections become memoryviews over the
+mapped file, so the operating system pages them in as they are used and
+several processes share the same physical memory.
+
+The cache rebuilds itself when:
+ - The file is missing or cannot be read
+ - The format version, byte order or min_length differ
+ - The SHA-256 of the source word list has changed
+
+Key Functions:
+ - cache_path_for(source_path, min_length):
+        - data/enable1.txt -> data/enable1.min3.lex
+ - source_hash(path):
+        - SHA-256 of the word list file
+ - save_cache(trie, cache_path, digest, min_length):
+        - Writes to a temporary file and renames it, so readers never see half a file
+ - load_cache(cache_path, digest, min_length):
+        - Returns a memory-mapped CompactTrie, or None if the cache is unusable
+ - load_or_build(source_path, min_length):
+        - Used by WordValidator, loads the cache or rebuilds it from the word list
+'''
+
+MAGIC = b'BGLX'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sIBxxxIII32s')
+BYTE_ORDER = 0 if sys.byteorder == 'little' else 1
+ALIGNMENT = 8
+
+
+def cache_path_for(source_path, min_length=3):
+    base, _ = os.path.splitext(source_path)
+    return f"{base}.min{min_length}.lex"
+
+
+def source_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def read_words(source_path, min_length=3):
+    with open(source_path, 'r') as f:
+        words = []
+        for line in f:
+            word = line.strip().upper()
+            if len(word) >= min_length:
+                words.append(word)
+    return words
+
+
+def _padding(offset):
+    return (-offset) % ALIGNMENT
+
+
+def save_cache(trie, cache_path, digest, min_length=3):
+    sections = [bytes(getattr(trie, name)) for name, _ in CompactTrie.ARRAYS]
+    temp_path = f"{cache_path}.tmp{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER, min_length,
+                             trie.node_count, trie.word_count, digest)
+        f.write(header)
+        offset = len(header)
+        for section in sections:
+            pad = _padding(offset)
+            f.write(b'\0' * pad)
+            f.write(section)
+            offset += pad + len(section)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, cache_path)
+
+
+def load_cache(cache_path, digest=None, min_length=3):
+    try:
+        with open(cache_path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(buffer) < HEADER.size:
+        buffer.close()
+        return None
+    magic, version, byte_order, cached_min_length, node_count, word_count, cached_digest = \
+        HEADER.unpack_from(buffer, 0)
+    if (magic != MAGIC or version != FORMAT_VERSION or byte_order != BYTE_ORDER
+            or cached_min_length != min_length
+            or (digest is not None and cached_digest != digest)):
+        buffer.close()
+        return None
+
+    view = memoryview(buffer)
+    offset = HEADER.size
+    arrays = {}
+    for name, typecode in CompactTrie.ARRAYS:
+        itemsize = 1 if typecode == 'B' else 4
+        offset += _padding(offset)
+        end = offset + node_count * itemsize
+        if end > len(buffer):
+            view.release()
+            buffer.close()
+            return None
+        arrays[name] = view[offset:end] if typecode == 'B' else view[offset:end].cast(typecode)
+        offset = end
+
+    # bytes.find() is what makes child lookups fast, so copy the small label section
+    arrays['labels'] = bytes(arrays['labels'])
+    return CompactTrie.from_arrays(arrays, word_count, buffer=buffer)
+
+
+def load_or_build(source_path, min_length=3):
+    cache_path = cache_path_for(source_path, min_length)
+    digest = source_hash(source_path)
+    trie = load_cache(cache_path, digest, min_length)
+    if trie is not None:
+        return trie
+
+    print(f"Building dictionary cache {cache_path}")
+    trie = CompactTrie(read_words(source_path, min_length))
+    try:
+        save_cache(trie, cache_path, digest, min_length)
+    except OSError as e:
+        print(f"Could not write dictionary cache: {e}")
+    return trie
+
+
+if __name__ == '__main__':
+    # Build step: python -m modules.lexiconCache [word_list] [min_length]
+    source = sys.argv[1] if len(sys.argv) > 1 else 'data/enable1.txt'
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    built = load_or_build(source, length)
+    print(f"{cache_path_for(source, length)}: {built.word_count} words, {built.node_count} nodes")
@@ -0,0 +1,166 @@
+import threading
+from collections import OrderedDict
+from modules.dictionaryRegistry import get_validator
+from modules.frequencyIndex import get_frequency_index
+from modules.solverEngine import word_score
+
+'''
+This file works out everything the post-game screens show about a finished game,
+so AnalyticsWindow and GameDetailWindow share one calculation.
+
+One pass over the game's possible words (upper-cased into a set, so every
+'is it found' check is O(1)) gives:
+ - found and missed - Sorted word lists
+ - by_length - Dictionary mapping word length -> {'found': [...], 'missed': [...]}
+ - points_left - Points the missed words were worth
+ - longest_missed - Longest missed word (alphabetically first on a tie), or None
+ - rarity - List of (label, found count, missed count), common words first, by
+        Zipf score from frequencyIndex.py (see RARITY_BANDS)
+
+GameAnalysis Class:
+ - The results above, plus found_count, possible_count and completion (percent),
+   the same figures the history list shows (see completion_counts())
+
+PostGameAnalyser Class:
+Key Attributes:
+ - self.cache - OrderedDict mapping game ID -> GameAnalysis, least recently used first
+Key Methods:
+ - analyse(self, game_data, game_id=None):
+        - GameAnalysis for a game dictionary (as saved by AnalyticsWindow),
+          kept under game_id (a history store ID) when one is given
+ - remember(self, game_id, analysis) / forget(self, game_id):
+        - Adds an analysis made before the game had an ID, or drops a deleted game
+
+Module Functions:
+ - completion_counts(game):
+        - (found, possible) for a game dictionary: each found word counts once, and only if it is
+          one of the possible words. Used here and by historyStore.summarise, so the history
+          list and the result screens always agree
+ - completion(found, possible):
+        - Percentage of possible words found, 0.0 when there are none
+ - get_post_game_analyser():
+        - The process-wide analyser for the shared dictionary
+'''
+
+# (label, lowest Zipf score), words below every band (or unknown to wordfreq) are 'Rare'
+RARITY_BANDS = (('Common', 4.0), ('Familiar', 3.0), ('Uncommon', 2.0), ('Rare', None))
+DEFAULT_CACHE_SIZE = 256
+
+
+def completion_counts(game):
+    found = set(word.upper() for word in game.get('found_words', []))
+    if 'all_possible_words' in game:
+        possible = set(word.upper() for word in game['all_possible_words'])
+        return len(found & possible), len(possible)
+    # The word list is in the solution store, pack() kept both counts (see solutionStore.py)
+    return game.get('found_count', len(found)), game.get('possible_count', 0)
+
+
+def completion(found, possible):
+    return (found / possible * 100) if possible > 0 else 0.0
+
+
+class GameAnalysis:
+    def __init__(self, found, missed, by_length, points_left, longest_missed, rarity):
+        self.found = found
+        self.missed = missed
+        self.by_length = by_length
+        self.points_left = points_left
+        self.longest_missed = longest_missed
+        self.rarity = rarity
+
+    @property
+    def found_count(self):
+        return len(self.found)
+
+    @property
+    def possible_count(self):
+        return len(self.found) + len(self.missed)
+
+    @property
+    def completion(self):
+        return completion(len(self.found), self.possible_count)
+
+
+class PostGameAnalyser:
+    def __init__(self, validator=None, frequencies=None, max_size=DEFAULT_CACHE_SIZE):
+        self.validator = validator if validator is not None else get_validator()
+        self.frequencies = frequencies
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def analyse(self, game_data, game_id=None):
+        if game_id is not None:
+            with self._lock:
+                analysis = self.cache.get(game_id)
+                if analysis is not None:
+                    self.cache.move_to_end(game_id)
+                    return analysis
+        analysis = self._analyse(game_data)
+        if game_id is not None:
+            self.remember(game_id, analysis)
+        return analysis
+
+    def remember(self, game_id, analysis):
+        with self._lock:
+            self.cache[game_id] = analysis
+            self.cache.move_to_end(game_id)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+
+    def forget(self, game_id):
+        with self._lock:
+            self.cache.pop(game_id, None)
+
+    def _analyse(self, game_data):
+        if self.frequencies is None:
+            self.frequencies = get_frequency_index(self.validator)
+        trie = self.validator.trie
+        frequencies = self.frequencies
+        found_words = set(word.upper() for word in game_data.get('found_words', []))
+        all_words = sorted(set(word.upper() for word in game_data.get('all_possible_words', [])))
+
+        found = []
+        missed = []
+        by_length = {}
+        points_left = 0
+        longest_missed = None
+        rarity = {label: [0, 0] for label, _ in RARITY_BANDS}
+        for word in all_words:
+            length = len(word)
+            group = by_length.get(length)
+            if group is None:
+                group = by_length[length] = {'found': [], 'missed': []}
+            is_found = word in found_words
+            if is_found:
+                found.append(word)
+                group['found'].append(word)
+            else:
+                missed.append(word)
+                group['missed'].append(word)
+                points_left += word_score(length)
+                # Words come in alphabetical order, so the first of the longest is kept
+                if longest_missed is None or length > len(longest_missed):
+                    longest_missed = word
+
+            zipf = frequencies.zipf(trie.walk(trie.ROOT, word))
+            for label, lowest in RARITY_BANDS:
+                if lowest is None or zipf >= lowest:
+                    rarity[label][0 if is_found else 1] += 1
+                    break
+
+        return GameAnalysis(found, missed, by_length, points_left, longest_missed,
+                            [(label, rarity[label][0], rarity[label][1]) for label, _ in RARITY_BANDS])
+
+
+_analyser = None
+_analyser_lock = threading.Lock()
+
+
+def get_post_game_analyser():
+    global _analyser
+    with _analyser_lock:
+        if _analyser is None:
+            _analyser = PostGameAnalyser()
+        return _analyser
@@ -0,0 +1,308 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+from array import array
+from modules.dictionaryRegistry import get_validator
+from modules.frequencyIndex import trie_fingerprint
+from modules.postGameAnalysis import completion_counts
+from modules.solveCache import canonical
+
+'''
+This file keeps the word list of every board saved in the game history once,
+so a saved game holds a short reference instead of its all_possible_words.
+
+Solutions are content addressed: the key is a hash of the board's canonical form
+(solveCache.canonical, so rotated and mirrored boards share a key) and of the
+dictionary it was solved with. The same board always gets the same key, and a
+board saved again adds nothing to the store.
+
+Word lists are stored as dictionary word IDs (positions in the sorted word list,
+see compactTrie.py): sorted, written as the gaps between neighbouring IDs in
+7-bit variable-length bytes, then base64. A 5x5 board of 500 words takes about
+1 KB instead of about 5 KB of JSON strings.
+
+data/solution_store.jsonl holds one solution per line:
+    {"key": "...", "board": "4x4:A,B,QU,...", "dictionary": 123, "source": "data/enable1.txt",
+     "min_length": 3, "count": 53, "words": "..."}
+Lines are appended (one O_APPEND write each) and solutions never change. retain()
+drops the solutions no saved game uses any more (HistoryStore.compact() calls it).
+
+Word IDs only mean something to the dictionary that made them ('dictionary' is
+its fingerprint, 'source' and 'min_length' say where to load it from). A solution
+is decoded with that dictionary, never solved again with another one: if it
+cannot be loaded as it was, words() gives None rather than a different list.
+Lists made with the basic fallback word list (no dictionary file) stay in the game.
+
+Key Attributes:
+ - self.path - The store file
+ - self.entries - Dictionary mapping key -> record, read from the file on first use
+
+Key Methods:
+ - put(self, board, words):
+        - Stores a word list, returns its key (None if a word is not an upper-case dictionary word)
+ - words(self, key):
+        - The sorted word list for key, or None if it is missing or its dictionary is gone
+ - retain(self, keys, snapshot=None):
+        - Rewrites the store with only the solutions whose key is in keys, and every solution
+          added after snapshot (size() taken before the keys were collected)
+ - pack(self, game) / unpack(self, game):
+        - Copy of a history game with all_possible_words swapped for 'solution',
+          'found_count' and 'possible_count', and back again (a game whose list cannot be restored is
+          returned as it is)
+
+Module Functions:
+ - encode_word_ids(word_ids) / decode_word_ids(text)
+ - get_solution_store():
+        - The process-wide store for data/solution_store.jsonl
+'''
+
+SOLUTION_STORE_PATH = 'data/solution_store.jsonl'
+OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+
+
+def encode_word_ids(word_ids):
+    data = bytearray()
+    previous = 0
+    for word_id in sorted(word_ids):
+        gap = word_id - previous
+        previous = word_id
+        while gap >= 0x80:
+            data.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        data.append(gap)
+    return base64.b64encode(bytes(data)).decode('ascii')
+
+
+def decode_word_ids(text):
+    word_ids = array('i')
+    previous = 0
+    gap = 0
+    shift = 0
+    for byte in base64.b64decode(text):
+        gap |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += gap
+        word_ids.append(previous)
+        gap = 0
+        shift = 0
+    return word_ids
+
+
+class SolutionStore:
+    def __init__(self, path=SOLUTION_STORE_PATH, validator=None):
+        self.path = path
+        self._validator = validator
+        self._fingerprint = None
+        self._word_nodes = {}
+        self.entries = None
+        self._lock = threading.Lock()
+
+    @property
+    def validator(self):
+        if self._validator is None:
+            self._validator = get_validator()
+        return self._validator
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = trie_fingerprint(self.validator.trie)
+        return self._fingerprint
+
+    def key(self, board):
+        board_key, _ = canonical(board)
+        return hashlib.sha1(f"{self.fingerprint}|{board_key}".encode('utf-8')).hexdigest()[:20]
+
+    def load(self):
+        entries = {}
+        try:
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        entries[record['key']] = record
+                    except (ValueError, KeyError, TypeError):
+                        # A line cut short by a crash
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Could not read solution store: {e}")
+        self.entries = entries
+
+    def put(self, board, words):
+        validator = self.validator
+        if not os.path.exists(validator.dictionary_path):
+            # The basic fallback word list, nothing to load it from again later
+            return None
+        trie = validator.trie
+        word_ids = []
+        for word in words:
+            # walk() ignores case, but only the upper-case spelling comes back out of word IDs
+            node = trie.walk(trie.ROOT, word) if word.isupper() else -1
+            if node < 0 or not trie.is_word(node):
+                return None
+            word_ids.append(trie.word_id(node))
+        key = self.key(board)
+        encoded = encode_word_ids(word_ids)
+        with self._lock:
+            if self.entries is None:
+                self.load()
+            stored = self.entries.get(key)
+            if stored is not None:
+                if stored.get('count') != len(word_ids) or stored.get('words') != encoded:
+                    # The stored list is not this game's (e.g. a damaged line), so the game keeps its own
+                    print(f"Solution {key} does not match the game's word list, keeping the list in the game")
+                    return None
+                return key
+            record = {'key': key, 'board': canonical(board)[0], 'dictionary': self.fingerprint,
+                      'source': validator.dictionary_path, 'min_length': validator.min_length,
+                      'count': len(word_ids), 'words': encoded}
+            try:
+                fd = os.open(self.path, OPEN_FLAGS, 0o644)
+                try:
+                    os.write(fd, (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8'))
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                print(f"Could not write solution store: {e}")
+                return None
+            self.entries[key] = record
+        return key
+
+    def words(self, key):
+        with self._lock:
+            if self.entries is None:
+                self.load()
+            record = self.entries.get(key)
+        if record is None:
+            return None
+        validator = self._validator_for(record)
+        if validator is None:
+            return None
+        return self._decode(record['words'], validator.trie)
+
+    def _validator_for(self, record):
+        """The dictionary a solution was made with, or None if it is not there as it was"""
+        if record.get('dictionary') == self.fingerprint:
+            return self.validator
+        source = record.get('source')
+        if source is None or not os.path.exists(source):
+            return None
+        validator = get_validator(source, record.get('min_length', 3))
+        if trie_fingerprint(validator.trie) != record.get('dictionary'):
+            # The file has changed since, its word IDs would give other words
+            return None
+        return validator
+
+    def _decode(self, text, trie):
+        word_nodes = self._word_nodes.get(id(trie))
+        if word_nodes is None:
+            word_nodes = array('i', [0]) * trie.word_count
+            for node, word_id in enumerate(trie.word_ids):
+                if word_id >= 0:
+                    word_nodes[word_id] = node
+            self._word_nodes[id(trie)] = word_nodes
+        # Word IDs follow the sorted word list, so the words come out sorted
+        return [trie.word_at(word_nodes[word_id]) for word_id in decode_word_ids(text)]
+
+    def size(self):
+        """Length of the store file, a snapshot for retain()"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def retain(self, keys, snapshot=None):
+        with self._lock:
+            for _ in range(3):
+                try:
+                    with open(self.path, 'rb') as f:
+                        data = f.read()
+                except FileNotFoundError:
+                    self.entries = {}
+                    return
+                entries = {}
+                lines = []
+                position = 0
+                for line in data.splitlines(keepends=True):
+                    offset = position
+                    position += len(line)
+                    try:
+                        record = json.loads(line)
+                        key = record['key']
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    # A solution added after the snapshot may belong to a game that is being saved
+                    # right now and is not in the history yet
+                    newer = snapshot is not None and offset >= snapshot
+                    if (key in keys or newer) and key not in entries:
+                        entries[key] = record
+                        lines.append(line if line.endswith(b'\n') else line + b'\n')
+                dropped = len(data.splitlines()) - len(lines)
+                if not dropped:
+                    self.entries = entries
+                    return
+                temp_path = f"{self.path}.tmp{os.getpid()}"
+                try:
+                    with open(temp_path, 'wb') as f:
+                        f.writelines(lines)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    # A solution another process added meanwhile would be lost, so try again
+                    if os.path.getsize(self.path) == len(data):
+                        os.replace(temp_path, self.path)
+                        self.entries = entries
+                        print(f"Dropped {dropped} unused solutions")
+                        return
+                    os.remove(temp_path)
+                except OSError as e:
+                    print(f"Could not rewrite solution store: {e}")
+                    return
+
+    def pack(self, game):
+        words = game.get('all_possible_words')
+        board = game.get('board')
+        # Only lists that come back exactly the same (sorted upper-case dictionary words) are moved
+        if not words or not board or words != sorted(set(words)):
+            return game
+        key = self.put(board, words)
+        if key is None:
+            return game
+        packed = dict(game)
+        # Counted while the list is here, so the history summary matches the result screens
+        packed['found_count'], packed['possible_count'] = completion_counts(game)
+        del packed['all_possible_words']
+        packed['solution'] = key
+        return packed
+
+    def unpack(self, game):
+        if 'solution' not in game or 'all_possible_words' in game:
+            return game
+        words = self.words(game['solution'])
+        if words is None:
+            print(f"Word list {game['solution']} was made with a dictionary that is no longer available")
+            return game
+        unpacked = dict(game)
+        del unpacked['solution']
+        unpacked.pop('found_count', None)
+        unpacked.pop('possible_count', None)
+        unpacked['all_possible_words'] = words
+        return unpacked
+
+
+_solution_store = None
+_solution_store_lock = threading.Lock()
+
+
+def get_solution_store():
+    global _solution_store
+    with _solution_store_lock:
+        if _solution_store is None:
+            _solution_store = SolutionStore()
+        return _solution_store
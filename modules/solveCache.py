@@ -0,0 +1,254 @@
+import atexit
+import json
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from modules.boardTopology import get_topology
+from modules.dictionaryRegistry import DEFAULT_DICTIONARY, DEFAULT_MIN_LENGTH, get_validator
+from modules.solverEngine import BoardSummary, SCORES
+
+'''
+This file remembers the words found on recently solved boards, so solving the
+same board again (during generation, at game start, in analytics or when a
+history game is replayed) is a dictionary lookup instead of a search.
+
+Rotating or mirroring a board does not change which words it holds, so all 8
+orientations of a square board (4 for other shapes) share one cache entry:
+ - Every orientation is written out as a row-by-row list of tiles
+ - The smallest list is the canonical form, and '4x4:A,B,QU,...' is its key
+ - Paths are stored in canonical cells, and mapped back into the orientation
+   the caller asked about on every lookup
+
+SolveCacheStats Class:
+ - hits, misses, size and max_size of a SolveCache, plus hit_rate
+
+SolveCache Class:
+Key Attributes:
+ - self.max_size - Most boards kept, the least recently used board is dropped first
+ - self.path - Optional JSON file the entries are saved in (None keeps the cache in memory),
+        read the first time the cache is used rather than when it is made, so creating a
+        WordFinder (e.g. in a window's constructor) never waits for the file
+ - self.dictionary - Name of the word list the entries were solved with,
+        a saved file made with another word list is ignored
+ - self.entries - OrderedDict mapping key -> {word: canonical cells}, oldest first
+Key Methods:
+ - canonical(self, board):
+        - Returns (key, order), order[i] is the board cell that sits at canonical cell i
+ - get(self, board):
+        - Dictionary mapping word -> list of (row, col) for this board, or None
+ - put(self, board, words):
+        - Stores a complete word -> path dictionary (e.g. SolveResult.words())
+        - Only boards that are played or kept should go in (BoardGenerator.remember,
+          WordFinder.find_all_words_with_paths), rejected generation candidates would
+          push them out
+ - summary(self, index, board, trie, include_word_ids=False, include_words=False):
+        - BoardSummary built from the cache, or None when the board is not cached
+        - Used by solverEngine.solve_many so batches skip boards they have already seen
+ - stats(self) / clear(self)
+ - load(self) / save(self):
+        - Reads or writes self.path, saving writes a temporary file and renames it
+
+Module Functions:
+ - canonical(board):
+        - Same as SolveCache.canonical, also used by solutionStore.py
+ - dictionary_tag():
+        - Name of the shared word list ('enable1.txt:3:172727'), saved with every file of solved
+          boards (this cache, boardPool.py) so a file made with another word list is ignored
+ - get_solve_cache():
+        - The process-wide cache for the shared dictionary, saved to data/solve_cache.json on exit
+'''
+
+SOLVE_CACHE_PATH = 'data/solve_cache.json'
+DEFAULT_CACHE_SIZE = 1024
+
+
+def _orientations(rows, cols):
+    """Cell orders for every rotation and reflection that keeps the board shape"""
+    topology = get_topology(rows, cols)
+    maps = [
+        lambda row, col: (row, col),
+        lambda row, col: (row, cols - 1 - col),
+        lambda row, col: (rows - 1 - row, col),
+        lambda row, col: (rows - 1 - row, cols - 1 - col),
+    ]
+    if rows == cols:
+        maps += [
+            lambda row, col: (col, row),
+            lambda row, col: (col, rows - 1 - row),
+            lambda row, col: (cols - 1 - col, row),
+            lambda row, col: (cols - 1 - col, rows - 1 - row),
+        ]
+    orders = []
+    for transform in maps:
+        order = [0] * topology.cell_count
+        for cell, (row, col) in enumerate(topology.coords):
+            order[topology.index(*transform(row, col))] = cell
+        orders.append(tuple(order))
+    return orders
+
+
+_orders = {}
+
+
+def canonical(board):
+    """Returns (key, order) for the orientation of board with the smallest row-by-row tiles"""
+    rows, cols = len(board), len(board[0])
+    orders = _orders.get((rows, cols))
+    if orders is None:
+        orders = _orders[(rows, cols)] = _orientations(rows, cols)
+    tiles = [letter.upper() for board_row in board for letter in board_row]
+    best_tiles, best_order = None, None
+    for order in orders:
+        candidate = [tiles[cell] for cell in order]
+        if best_tiles is None or candidate < best_tiles:
+            best_tiles, best_order = candidate, order
+    return f"{rows}x{cols}:{','.join(best_tiles)}", best_order
+
+
+class SolveCacheStats:
+    def __init__(self, hits, misses, size, max_size):
+        self.hits = hits
+        self.misses = misses
+        self.size = size
+        self.max_size = max_size
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self):
+        return (f"SolveCacheStats(hits={self.hits}, misses={self.misses}, hit_rate={self.hit_rate:.1%}, "
+                f"size={self.size}/{self.max_size})")
+
+
+class SolveCache:
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, path=None, dictionary=None):
+        self.max_size = max_size
+        self.path = path
+        self.dictionary = dictionary
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._dirty = False
+        self._loaded = path is None
+
+    def canonical(self, board):
+        return canonical(board)
+
+    def _load_once(self):
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load()
+
+    def get(self, board):
+        self._load_once()
+        key, order = self.canonical(board)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        coords = get_topology(len(board), len(board[0])).coords
+        return {word: [coords[order[cell]] for cell in cells] for word, cells in entry.items()}
+
+    def put(self, board, words):
+        self._load_once()
+        key, order = self.canonical(board)
+        topology = get_topology(len(board), len(board[0]))
+        position = {cell: canonical_cell for canonical_cell, cell in enumerate(order)}
+        entry = {word: tuple(position[topology.index(row, col)] for row, col in path)
+                 for word, path in words.items()}
+        with self._lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            self._dirty = True
+
+    def summary(self, index, board, trie, include_word_ids=False, include_words=False):
+        words = self.get(board)
+        if words is None:
+            return None
+        total_score = 0
+        for word in words:
+            total_score += SCORES[len(word)]
+        word_ids = None
+        if include_word_ids:
+            word_ids = array('i', sorted(trie.word_id(trie.walk(trie.ROOT, word)) for word in words))
+        return BoardSummary(index, board, len(words), total_score, word_ids,
+                            words if include_words else None, True, 0.0)
+
+    def stats(self):
+        self._load_once()
+        with self._lock:
+            return SolveCacheStats(self.hits, self.misses, len(self.entries), self.max_size)
+
+    def clear(self):
+        with self._lock:
+            self._loaded = True
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self._dirty = True
+
+    def load(self):
+        self._loaded = True
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load solve cache: {e}")
+            return
+        if data.get('dictionary') != self.dictionary:
+            return
+        with self._lock:
+            for key, entry in data.get('boards', []):
+                self.entries[key] = {word: tuple(cells) for word, cells in entry.items()}
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            # Oldest first, so loading the file restores the same LRU order
+            data = {'dictionary': self.dictionary,
+                    'boards': [[key, {word: list(cells) for word, cells in entry.items()}]
+                               for key, entry in self.entries.items()]}
+            self._dirty = False
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Could not save solve cache: {e}")
+
+
+_solve_cache = None
+_solve_cache_lock = threading.Lock()
+
+
+def dictionary_tag():
+    trie = get_validator().trie
+    return f"{os.path.basename(DEFAULT_DICTIONARY)}:{DEFAULT_MIN_LENGTH}:{trie.word_count}"
+
+
+def get_solve_cache():
+    global _solve_cache
+    with _solve_cache_lock:
+        if _solve_cache is None:
+            _solve_cache = SolveCache(path=SOLVE_CACHE_PATH, dictionary=dictionary_tag())
+            atexit.register(_solve_cache.save)
+        return _solve_cache
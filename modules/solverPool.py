@@ -0,0 +1,134 @@
+import multiprocessing
+import os
+import queue
+from collections import deque
+from modules.lexiconCache import cache_path_for, load_cache, load_or_build
+from modules.solverEngine import BoardSolver
+
+'''
+This file spreads board solving over several processes.
+Solving is pure Python, so threads cannot use more than one core because of the GIL.
+
+The dictionary is not copied into each worker. The parent makes sure the binary
+cache from lexiconCache.py exists, and every worker memory-maps that same file
+read-only. The operating system keeps one copy of the pages for all of them.
+
+SolverPool Class:
+Key Attributes:
+ - self.workers - Number of worker processes
+ - self.chunk_size - Number of boards sent to a worker in one task
+ - self.max_pending - Most chunks in flight at once, so a huge batch does not fill memory
+
+Key Methods:
+ - __init__(self, workers=None, dictionary_path='data/enable1.txt', min_length=3, chunk_size=64):
+        - Builds the dictionary cache if needed, then starts the workers
+        - workers defaults to the number of CPUs
+ - solve_many(self, boards, include_word_ids=False, word_limit=None, include_words=False, ordered=True):
+        - Generator yielding a BoardSummary per board, like solverEngine.solve_many
+        - ordered=True keeps the input order, ordered=False yields chunks as soon as they finish
+ - find_all_words(self, boards, ordered=True):
+        - Generator yielding (index, sorted word list) per board
+ - close(self):
+        - Stops the workers (also called when used in a 'with' block)
+
+Worker functions (module level so they can be sent to other processes):
+ - _init_worker(cache_path, source_path, min_length) - Maps the shared dictionary once per worker
+ - _solve_chunk(start, boards, include_word_ids, word_limit, include_words) - Solves one chunk of boards
+ - _words_chunk(start, boards) - Returns the sorted words for one chunk of boards
+'''
+
+_worker_solver = None
+
+
+def _init_worker(cache_path, source_path, min_length):
+    global _worker_solver
+    trie = load_cache(cache_path, None, min_length)
+    if trie is None:
+        trie = load_or_build(source_path, min_length)
+    _worker_solver = BoardSolver(trie)
+
+
+def _solve_chunk(start, boards, include_word_ids, word_limit, include_words):
+    summaries = []
+    for offset, board in enumerate(boards):
+        _worker_solver.reset(board)
+        _worker_solver.run(word_limit=word_limit)
+        summaries.append(_worker_solver.summary(start + offset, include_word_ids, include_words))
+    return summaries
+
+
+def _words_chunk(start, boards):
+    return [(start + offset, _worker_solver.solve(board).sorted_words())
+            for offset, board in enumerate(boards)]
+
+
+def _chunks(boards, chunk_size):
+    chunk = []
+    start = 0
+    for board in boards:
+        chunk.append(board)
+        if len(chunk) == chunk_size:
+            yield start, chunk
+            start += chunk_size
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+class SolverPool:
+    def __init__(self, workers=None, dictionary_path='data/enable1.txt', min_length=3, chunk_size=64):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = self.workers * 4
+        load_or_build(dictionary_path, min_length)  # make sure the shared cache file exists
+        self._pool = multiprocessing.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(cache_path_for(dictionary_path, min_length), dictionary_path, min_length)
+        )
+
+    def solve_many(self, boards, include_word_ids=False, word_limit=None, include_words=False, ordered=True):
+        tasks = ((start, chunk, include_word_ids, word_limit, include_words)
+                 for start, chunk in _chunks(boards, self.chunk_size))
+        return self._stream(_solve_chunk, tasks, ordered)
+
+    def find_all_words(self, boards, ordered=True):
+        return self._stream(_words_chunk, _chunks(boards, self.chunk_size), ordered)
+
+    def _stream(self, function, tasks, ordered):
+        if ordered:
+            pending = deque()
+            for args in tasks:
+                pending.append(self._pool.apply_async(function, args))
+                if len(pending) >= self.max_pending:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+        else:
+            finished = queue.Queue()
+            in_flight = 0
+            for args in tasks:
+                self._pool.apply_async(function, args, callback=finished.put, error_callback=finished.put)
+                in_flight += 1
+                if in_flight >= self.max_pending:
+                    yield from self._next_finished(finished)
+                    in_flight -= 1
+            while in_flight:
+                yield from self._next_finished(finished)
+                in_flight -= 1
+
+    def _next_finished(self, finished):
+        results = finished.get()
+        if isinstance(results, BaseException):
+            raise results
+        return results
+
+    def close(self):
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,9 +1,13 @@
 import os
+from modules.compactTrie import CompactTrie
+from modules.lexiconCache import load_or_build
 
 '''
 This file validates the current word with a dictionary
 Uses a prefix tree (Trie) data structure
 Enables real-time word validation during gameplay
+WordValidator stores its words in a CompactTrie (see compactTrie.py)
+The TrieNode/Trie classes below are the original dict-per-node version, kept for comparison benchmarks
 
 TrieNode Class:
 Key Attributes:
@@ -14,6 +18,7 @@ Key Attributes:
 Trie Class:
 Key Attributes:
  - self.root - The root TrieNode
+ - self.frozen - Boolean value, once True the Trie refuses new words
 
 Key Methods:
  - __init__(self):
@@ -38,24 +43,33 @@ Key Methods:
         - Follow prefix path letter by letter from root
         - Return False if prefix path does not exist
         - Return True if path exists 
+ - freeze(self):
+        - Stops any more words being inserted
+        - Used once the Trie is shared between several parts of the game
     
 WordValidator Class:
 Key Attributes:
- - self.trie - Trie instance containing entire dictionary
+ - self.trie - CompactTrie instance containing entire dictionary
+ - self.min_length - Shortest word kept from the dictionary file
+ - self.dictionary_path - The dictionary file (other caches such as frequencyIndex.py are named after it)
  
 Key Methods:
- - __init__(self, dictionary_path='data/enable1.txt'): 
+ - __init__(self, dictionary_path='data/enable1.txt', min_length=3): 
         - Constructor that builds complete dictionary Trie
         - Attempts to load dictionary file
         - Fall back to basic word list if file is unavailable
+        - Games should use dictionaryRegistry.get_validator() instead, so the Trie is only built once
  - load_dictionary(self, path)
-        - Reads dictionary file and populates the Trie
+        - Loads the CompactTrie from its binary cache (see lexiconCache.py)
+        - If the cache is missing or out of date, reads the dictionary file and rebuilds it
         - Checks if dictionary exists
         - Strip whitespaces, converts to uppercase
-        - Only include words ≥ 3 letters (According to Boggle rules)
+        - Only include words ≥ min_length letters (3 according to Boggle rules)
         - Displays word count loaded
  - load_basic_words(self)
         - Fallback dictionary if 'enable1.txt' is unavailable
+ - freeze(self):
+        - Makes the dictionary read-only so it can be shared safely
  - is_valid_word(self, word):
         - Public interface checking if word exists in dictionary
  - is_valid_prefix(self, prefix):
@@ -70,8 +84,11 @@ class TrieNode:
 class Trie:
     def __init__(self):
         self.root = TrieNode()
+        self.frozen = False
 
     def insert(self, word):
+        if self.frozen:
+            raise RuntimeError("Cannot insert into a frozen Trie")
         node = self.root
         for char in word.upper():
             if char not in node.children:
@@ -95,10 +112,15 @@ class Trie:
             node = node.children[char]
         return True
 
+    def freeze(self):
+        self.frozen = True
+
 
 class WordValidator:
-    def __init__(self, dictionary_path='data/enable1.txt'):
-        self.trie = Trie()
+    def __init__(self, dictionary_path='data/enable1.txt', min_length=3):
+        self.trie = CompactTrie()
+        self.min_length = min_length
+        self.dictionary_path = dictionary_path
         self.load_dictionary(dictionary_path)
 
     def load_dictionary(self, path):
@@ -107,14 +129,8 @@ class WordValidator:
             self.load_basic_words()
             return
         try:
-            with open(path, 'r') as f:
-                word_count = 0
-                for line in f:
-                    word = line.strip().upper()
-                    if len(word) >= 3:
-                        self.trie.insert(word)
-                        word_count += 1
-                print(f"Loaded {word_count} words from dictionary")
+            self.trie = load_or_build(path, self.min_length)
+            print(f"Loaded {self.trie.word_count} words from dictionary")
         except Exception as e:
             print(f"Error loading dictionary: {e}")
             self.load_basic_words()
@@ -126,8 +142,10 @@ class WordValidator:
             'CAN', 'HER', 'WAS', 'ONE', 'OUR', 'OUT', 'DAY', 'GET',
             'HAS', 'HIM', 'HIS', 'HOW', 'ITS', 'MAY', 'NEW', 'NOW'
         ]
-        for word in basic_words:
-            self.trie.insert(word)
+        self.trie = CompactTrie(basic_words)
+
+    def freeze(self):
+        self.trie.freeze()
 
     def is_valid_word(self, word):
         return self.trie.search(word)
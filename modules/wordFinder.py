@@ -1,4 +1,7 @@
-from modules.validation import WordValidator
+from modules.dictionaryRegistry import get_validator
+from modules.boardTopology import get_topology
+from modules.solverEngine import BoardSolver, solve_many
+from modules.solveCache import get_solve_cache
 
 '''
 This file discovers all valid words hidden in a Boggle board.
@@ -6,19 +9,43 @@ We use DFS with prefix pruning to ensure optimisation.
 
 Key Attributes:
  - self.validator - WordValidator instance containing the Trie dictionary
+ - self.pool - Optional SolverPool, when set solve_many runs on several processes
+ - self.cache - SolveCache for boards solved before (see solveCache.py), or None
+        - Defaults to the shared cache when the shared dictionary is used
+        - Only the 'stack' mode and local solve_many use it (pool workers are other processes)
+ - self.mode - 'stack' (default), 'cursor' or 'prefix'
+        - 'stack' uses the iterative BoardSolver from solverEngine.py, which also records paths
+        - 'cursor' passes the current trie node down the recursion, so each step is one child lookup
+        - 'prefix' is the original search that re-checks the whole word from the root at every step
 
 Key Methods:
- - __init__(self): 
+ - __init__(self, validator=None, mode='stack', pool=None, cache=None): 
         - Constructor that initialises the word finder
-        - Creates a WordValidator instance with loaded dictionary Trie
+        - Uses the given WordValidator, or the shared one from dictionaryRegistry
+        - Uses the given SolveCache, or the shared one if no validator was given
  - find_all_words(self, board):
         - Completes the search across the board
         - Creates empty set to store unique words
         - Determines board dimensions (4x4 or 5x5)
         - Stats DFS from every possible starting position
         - Creates new visited matrix for each starting position
-        - Returns a sorted list of all discovered words
+        - Returns a sorted list of all discovered words, in upper case ('Qu' tiles give 'QU')
         - We must start from every cell because words can begin anywhere on the board
+        - Every mode returns exactly the same words
+ - find_all_words_with_paths(self, board):
+        - Returns a dictionary mapping each word to the list of (row, col) tiles that spell it
+        - Always uses the iterative solver, which is the only mode that records paths
+        - Looks in self.cache first, and stores every new board it solves there
+ - solve_many(self, boards, include_word_ids=False, word_limit=None, include_words=False):
+        - Generator yielding a BoardSummary (word count, total score, optional word IDs and paths) per board
+        - Used for generating boards and for offline difficulty calibration over many boards
+        - Runs on self.pool when one was given (see solverPool.py)
+ - dfs_cursor(self, tiles, neighbours, cell, node, current_word, visited, found_words):
+        - Same search as dfs, but 'node' is the trie node for current_word
+        - Each tile is turned into (letter codes, letter) once per board, so 'Qu' is two child lookups
+        - A missing child means no word starts with current_word, so we stop straight away
+        - Cells and neighbour lists come from boardTopology, so there are no bounds checks
+        - 'visited' is an integer bitmask, so nothing is allocated to track the path
  - dfs(self, board, row, col, current_word, visited, found_words):
         - Recursive depth-first search that explores all possible word paths
         - Parameters:
@@ -61,19 +88,52 @@ FUNCTION dfs(board, row, col, current_word, visited, found_words):
     FOR i in direction [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), 
 '''
 class WordFinder:
-    def __init__(self):
-        self.validator = WordValidator()
+    def __init__(self, validator=None, mode='stack', pool=None, cache=None):
+        if cache is None and validator is None:
+            cache = get_solve_cache()
+        self.validator = validator if validator is not None else get_validator()
+        self.mode = mode
+        self.pool = pool
+        self.cache = cache
+        self.solver = BoardSolver(self.validator.trie)
 
     def find_all_words(self, board):
+        if self.mode == 'stack':
+            if self.cache is None:
+                return self.solver.solve(board).sorted_words()
+            return sorted(self.find_all_words_with_paths(board))
+
         words = set() # Prevent word duplication
         rows = len(board)
         cols = len(board[0])
-        for row in range(rows):
-            for col in range(cols):
-                visited = [[False] * cols for _ in range(rows)]
-                self.dfs(board, row, col, "", visited, words)
+        if self.mode == 'prefix':
+            for row in range(rows):
+                for col in range(cols):
+                    visited = [[False] * cols for _ in range(rows)]
+                    self.dfs(board, row, col, "", visited, words)
+        else:
+            trie = self.validator.trie
+            topology = get_topology(rows, cols)
+            tiles = [(letter.upper().encode('ascii', 'replace'), letter) for letter in topology.flatten(board)]
+            for cell in range(topology.cell_count):
+                self.dfs_cursor(tiles, topology.neighbours, cell, trie.ROOT, "", 0, words)
+
+        return sorted(word.upper() for word in words)
 
-        return sorted(list(words))
+    def find_all_words_with_paths(self, board):
+        if self.cache is None:
+            return self.solver.solve(board).words()
+        words = self.cache.get(board)
+        if words is None:
+            words = self.solver.solve(board).words()
+            self.cache.put(board, words)
+        return words
+
+    def solve_many(self, boards, include_word_ids=False, word_limit=None, include_words=False):
+        if self.pool is not None:
+            return self.pool.solve_many(boards, include_word_ids, word_limit, include_words)
+        return solve_many(boards, self.validator.trie, include_word_ids, word_limit, include_words,
+                          cache=self.cache)
 
     def dfs(self, board, row, col, current_word, visited, found_words):
         """Depth-first search with prefix pruning"""
@@ -95,4 +155,22 @@ class WordFinder:
         for dr, dc in directions:
             self.dfs(board, row + dr, col + dc, current_word, visited, found_words)
 
-        visited[row][col] = False
\ No newline at end of file
+        visited[row][col] = False
+
+    def dfs_cursor(self, tiles, neighbours, cell, node, current_word, visited, found_words):
+        """Depth-first search that carries the trie node instead of re-walking the prefix"""
+        trie = self.validator.trie
+        codes, letter = tiles[cell]
+        for code in codes:
+            node = trie.child(node, code)
+            if node < 0:
+                return
+        current_word += letter
+        visited |= 1 << cell
+
+        if len(current_word) >= 3 and trie.is_word(node):
+            found_words.add(current_word)
+
+        for neighbour in neighbours[cell]:
+            if not visited >> neighbour & 1:
+                self.dfs_cursor(tiles, neighbours, neighbour, node, current_word, visited, found_words)